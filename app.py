@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
-import joblib
 
-from src.kitting.kitting_engine import FormworkKittingEngine
+from src.core.paths import data_path
+from src.ingest.vocabularies import normalize_payload
+from src.kitting.kitting_engine import SCENARIO_OVERRIDES, FormworkKittingEngine
+# Model snapshot shared by all sessions, loaded on first prediction
+from src.ml.predict import load_model
 from src.optimization.scenario_simulator import ScenarioSimulator
 
 # -----------------------------
@@ -14,15 +17,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# -----------------------------
-# LOAD ML MODEL (CACHED)
-# -----------------------------
-@st.cache_resource
-def load_model():
-    return joblib.load("models/formwork_demand_model.pkl")
-
-model = load_model()
-
 # -----------------------------
 # SESSION STATE (AUTH)
 # -----------------------------
@@ -88,7 +82,7 @@ def boq_kitting_page():
     with col1:
         project_type = st.selectbox(
             "Project Type",
-            ["Residential", "Commercial", "Infrastructure"]
+            ["Residential", "Commercial", "Industrial"]
         )
         floors = st.number_input("Number of Floors", min_value=1, value=10)
         element_type = st.selectbox(
@@ -108,7 +102,7 @@ def boq_kitting_page():
         reuse_limit = st.number_input("Reuse Limit", min_value=1, value=20)
 
     if st.button("🔮 Predict Requirement"):
-        input_df = pd.DataFrame([{
+        input_df = pd.DataFrame([normalize_payload({
             "project_type": project_type,
             "floors": floors,
             "element_type": element_type,
@@ -118,9 +112,9 @@ def boq_kitting_page():
             "cycle_time_days": cycle_time_days,
             "total_units": total_units,
             "reuse_limit": reuse_limit
-        }])
+        })])
 
-        prediction = model.predict(input_df)[0]
+        prediction = load_model().predict(input_df)[0]
 
         colA, colB = st.columns(2)
         colA.metric("🔩 Required New Units", int(round(prediction)))
@@ -137,8 +131,8 @@ def inventory_page():
 
     if st.button("🔄 Generate Kitting Plan"):
         engine = FormworkKittingEngine(
-            inventory_path="data/inventory.csv",
-            schedule_path="data/schedule.csv"
+            inventory_path=data_path("inventory.csv"),
+            schedule_path=data_path("schedule.csv")
         )
 
         df = engine.build_kitting_plan()
@@ -160,7 +154,7 @@ def scenario_analysis_page():
     with col1:
         project_type = st.selectbox(
             "Project Type",
-            ["Residential", "Commercial", "Infrastructure"]
+            ["Residential", "Commercial", "Industrial"]
         )
         floors = st.number_input("Floors", min_value=1, value=8)
         area = st.number_input("Area (sqm)", min_value=100.0, value=12000.0)
@@ -267,11 +261,23 @@ def project_updates_page():
             "reuse_limit": new_reuse_limit
         }
 
-        prediction = model.predict(pd.DataFrame([payload]))[0]
+        prediction = load_model().predict(pd.DataFrame([normalize_payload(payload)]))[0]
 
         updated_duration = base_duration + delay_days
         shortage_risk = "HIGH" if prediction > base_inventory else "LOW"
 
+        # Kitting re-plan under the updated conditions (cached inputs)
+        simulator = ScenarioSimulator({
+            key: value for key, value in payload.items()
+            if key not in SCENARIO_OVERRIDES
+        })
+        simulator.run_scenario("Baseline", {})
+        simulator.run_scenario("Updated", {
+            "start_day_shift": delay_days,
+            "cycle_time_days": new_cycle_time,
+            "reuse_limit": new_reuse_limit
+        })
+
         # -----------------------------
         # RESULTS
         # -----------------------------
@@ -298,6 +304,9 @@ def project_updates_page():
                 shortage_risk
             )
 
+        st.subheader("🧩 Kitting Impact")
+        st.dataframe(simulator.get_comparison_table(), use_container_width=True)
+
         # -----------------------------
         # INSIGHTS
         # -----------------------------
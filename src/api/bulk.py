@@ -0,0 +1,166 @@
+import csv
+import json
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+from src.ml.predict import predict_formwork_batch
+
+BULK_FORMATS = ("ndjson", "csv")
+
+# Longer lines are dropped as they stream in, so a file without
+# newlines cannot grow the line buffer without bound
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class RequestDrivenStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body generator is itself reading the
+    request body. The stock response also polls receive() for a
+    disconnect, which would swallow upload chunks; here a disconnect
+    surfaces through the request stream instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+async def _iter_lines(byte_stream, max_line_bytes=MAX_LINE_BYTES):
+    """
+    Split an async byte stream into raw (undecoded) lines, holding at
+    most one partial line between chunks. A line longer than
+    max_line_bytes is dropped and yielded as None.
+    """
+    pending = b""
+    overlong = False   # skipping the rest of a line that was too long
+
+    async for chunk in byte_stream:
+        *lines, pending = (pending + chunk).split(b"\n")
+
+        for line in lines:
+            if overlong or len(line) > max_line_bytes:
+                overlong = False
+                yield None
+            elif line.strip():
+                yield line
+
+        if len(pending) > max_line_bytes:
+            overlong = True
+            pending = b""
+
+    if overlong or len(pending) > max_line_bytes:
+        yield None
+    elif pending.strip():
+        yield pending
+
+
+def _decode(line) -> str:
+    # UnicodeDecodeError is a ValueError: the row gets an error record
+    if line is None:
+        raise ValueError(f"line longer than {MAX_LINE_BYTES} bytes")
+    return line.decode("utf-8").rstrip("\r")
+
+
+def _to_payload(row: dict) -> dict:
+    # Model features are single values; a list / object would fail the
+    # whole chunk's batch call, so it is rejected with its row
+    nested = sorted(key for key, value in row.items() if isinstance(value, (dict, list)))
+    if nested:
+        raise ValueError(f"non-scalar value for {nested}")
+    return row
+
+
+def _predict_rows(payloads):
+    """
+    (prediction or None, error or None) per payload: one batched call,
+    or row by row when the batch fails, so one bad row cannot take the
+    rest of its chunk down
+    """
+    try:
+        return [(prediction, None) for prediction in predict_formwork_batch(payloads)]
+    except Exception:
+        pass
+
+    results = []
+    for payload in payloads:
+        try:
+            results.append((predict_formwork_batch([payload])[0], None))
+        except Exception as exc:
+            results.append((None, f"scoring failed: {exc}"))
+    return results
+
+
+def _score_chunk(rows):
+    """
+    rows: (row_no, payload or None, error or None)
+    Returns the NDJSON block for the chunk, in input order.
+    """
+    valid = [payload for _, payload, error in rows if error is None]
+    results = iter(_predict_rows(valid) if valid else [])
+
+    out = []
+    for row_no, payload, error in rows:
+        if error is None:
+            prediction, error = next(results)
+
+        if error is not None:
+            record = {"row": row_no, "error": error}
+        else:
+            record = {
+                "row": row_no,
+                "predicted_new_units": int(round(prediction))
+            }
+            if "project_id" in payload:
+                record["project_id"] = payload["project_id"]
+        out.append(json.dumps(record))
+
+    return "\n".join(out) + "\n"
+
+
+async def stream_bulk_predictions(byte_stream, fmt="ndjson", chunk_size=1000):
+    """
+    Parse the upload chunk by chunk, score each chunk with one batched
+    model call and yield NDJSON results. The next part of the upload is
+    read only once the previous results were handed to the client, so
+    memory stays bounded by chunk_size rows of at most MAX_LINE_BYTES.
+    """
+    header = None
+    row_no = 0
+    chunk = []
+
+    async for line in _iter_lines(byte_stream):
+        if fmt == "csv" and header is None:
+            try:
+                header = next(csv.reader([_decode(line)]))
+            except ValueError as exc:
+                # No header, no rows: report it instead of an empty 200
+                yield json.dumps({"error": f"unreadable CSV header: {exc}"}) + "\n"
+                return
+            continue
+
+        try:
+            line = _decode(line)
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} fields, got {len(values)}")
+                row = {k: (v if v != "" else None) for k, v in zip(header, values)}
+            else:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("row is not a JSON object")
+            chunk.append((row_no, _to_payload(row), None))
+        except ValueError as exc:
+            chunk.append((row_no, None, str(exc)))
+
+        row_no += 1
+
+        if len(chunk) >= chunk_size:
+            yield await run_in_threadpool(_score_chunk, chunk)
+            chunk = []
+
+    if chunk:
+        yield await run_in_threadpool(_score_chunk, chunk)
@@ -0,0 +1,279 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+
+# name -> (method, path, sends a project payload)
+ENDPOINTS = {
+    "predict": ("POST", "/predict-formwork", True),
+    "plans": ("GET", "/kitting-plans/latest", False),
+    "peak_demand": ("GET", "/peak-demand", False),
+    "health": ("GET", "/", False),
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+def build_payloads(projects_path, boq_path=None, owner="loadtest", seed=42):
+    """
+    /predict-formwork payloads from the project portfolio: floors and
+    type from projects.csv, area and duration from the project's BoQ
+    lines when available. The target API must know `owner`.
+    """
+    projects = pd.read_csv(projects_path)
+    rng = np.random.default_rng(seed)
+
+    if boq_path is not None and os.path.exists(boq_path):
+        boq = pd.read_csv(
+            boq_path,
+            usecols=["project_id", "area_sqm", "planned_start_day", "cycle_time_days"]
+        )
+        boq["end_day"] = boq["planned_start_day"] + boq["cycle_time_days"]
+        per_project = boq.groupby("project_id").agg(
+            area=("area_sqm", "sum"),
+            first_day=("planned_start_day", "min"),
+            last_day=("end_day", "max"),
+        )
+        projects = projects.join(per_project, on="project_id")
+        duration = projects["last_day"] - projects["first_day"]
+    else:
+        projects["area"] = projects["floors"] * rng.uniform(400, 1500, len(projects))
+        duration = projects["floors"] * 7
+
+    return [
+        {
+            "owner": owner,
+            "project_type": row.project_type,
+            "area": round(float(row.area), 2),
+            "floors": int(row.floors),
+            "duration_days": int(days),
+        }
+        for row, days in zip(projects.itertuples(index=False), duration.fillna(180))
+    ]
+
+
+def parse_mix(mix):
+    """
+    "predict=8,plans=1" -> {"predict": 0.8, "plans": 0.1, ...}
+    """
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+# -----------------------------
+# Server
+# -----------------------------
+class LocalServer:
+    """
+    The API on localhost, served by uvicorn in a background thread
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765):
+        import uvicorn
+
+        config = uvicorn.Config("src.api.main:app", host=host, port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.url = f"http://{host}:{port}"
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self.server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("API server failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self._thread.join()
+
+
+# -----------------------------
+# Load generator
+# -----------------------------
+def _schedule(n_requests, mix, n_payloads, seed):
+    rng = np.random.default_rng(seed)
+    names = list(mix)
+    endpoints = rng.choice(len(names), size=n_requests, p=[mix[name] for name in names])
+    payloads = rng.integers(0, n_payloads, size=n_requests)
+    return [(names[e], int(p)) for e, p in zip(endpoints, payloads)]
+
+
+def run_load(
+    url,
+    payloads,
+    requests=500,
+    rate=None,
+    concurrency=8,
+    mix=None,
+    warmup=5,
+    timeout=60.0,
+    seed=0
+):
+    """
+    Fire `requests` requests at `url`.
+
+    rate=None: closed loop, `concurrency` clients back to back.
+    rate=R: open loop, request i is due at i / R seconds. Latency is
+    measured from the due time, so queueing behind a slow server
+    counts (no coordinated omission); concurrency caps in-flight
+    requests.
+
+    Returns one row per request: endpoint, status, latency_ms, ok.
+    """
+    mix = mix or {"predict": 1.0}
+    plan = _schedule(requests, mix, len(payloads), seed)
+
+    with httpx.Client(base_url=url, timeout=timeout, limits=httpx.Limits(max_connections=concurrency)) as client:
+
+        def send(endpoint, payload_no):
+            method, path, with_payload = ENDPOINTS[endpoint]
+            body = payloads[payload_no] if with_payload else None
+            response = client.request(method, path, json=body)
+            return response.status_code
+
+        # Model load, tenant parse, first plans: not part of the measurement
+        for endpoint, payload_no in plan[:warmup]:
+            send(endpoint, payload_no)
+
+        records = []
+        lock = threading.Lock()
+
+        def timed(endpoint, payload_no, due):
+            # Closed loop: the clock starts when a client is free
+            if due is None:
+                due = time.perf_counter()
+
+            try:
+                status = send(endpoint, payload_no)
+            except httpx.HTTPError:
+                status = 0
+            latency = time.perf_counter() - due
+
+            with lock:
+                records.append((endpoint, status, latency * 1000, time.perf_counter()))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i, (endpoint, payload_no) in enumerate(plan):
+                if rate:
+                    due = started + i / rate
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    due = None
+                pool.submit(timed, endpoint, payload_no, due)
+
+    df = pd.DataFrame(records, columns=["endpoint", "status", "latency_ms", "finished"])
+    df["ok"] = df["status"].between(200, 299)
+    df["finished"] -= started
+    return df
+
+
+def summarize(records: pd.DataFrame):
+    """
+    Throughput + latency percentiles per endpoint and overall
+    """
+    wall_seconds = float(records["finished"].max()) if len(records) else 0.0
+
+    def stats(group):
+        latency = group["latency_ms"].to_numpy()
+        return {
+            "requests": int(len(group)),
+            "errors": int((~group["ok"]).sum()),
+            "throughput_rps": round(len(group) / wall_seconds, 2) if wall_seconds else None,
+            "mean_ms": round(float(latency.mean()), 2),
+            **{
+                f"p{q}_ms": round(float(np.percentile(latency, q)), 2)
+                for q in PERCENTILES
+            },
+            "max_ms": round(float(latency.max()), 2),
+        }
+
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "overall": stats(records),
+        "endpoints": {
+            endpoint: stats(group)
+            for endpoint, group in records.groupby("endpoint", sort=True)
+        },
+    }
+
+
+# -----------------------------
+# Results
+# -----------------------------
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(summary, config, out_dir="loadtest_results", label=None):
+    os.makedirs(out_dir, exist_ok=True)
+
+    now = datetime.now(timezone.utc)
+    revision = _git_revision()
+    name = "-".join(filter(None, [now.strftime("%Y%m%dT%H%M%SZ"), label or revision]))
+    path = os.path.join(out_dir, f"{name}.json")
+
+    with open(path, "w") as f:
+        json.dump({
+            "label": label,
+            "git_revision": revision,
+            "created_at": now.isoformat(),
+            "config": config,
+            "summary": summary,
+        }, f, indent=2)
+
+    return path
+
+
+def compare_results(baseline_path, candidate_path) -> pd.DataFrame:
+    """
+    Per endpoint metric: baseline, candidate, change in percent
+    (positive = higher latency / higher throughput in the candidate)
+    """
+    runs = []
+    for path in (baseline_path, candidate_path):
+        with open(path) as f:
+            runs.append(json.load(f)["summary"])
+
+    rows = []
+    for endpoint in sorted(set(runs[0]["endpoints"]) | set(runs[1]["endpoints"])):
+        before = runs[0]["endpoints"].get(endpoint, {})
+        after = runs[1]["endpoints"].get(endpoint, {})
+
+        for metric in ["throughput_rps", *[f"p{q}_ms" for q in PERCENTILES], "errors"]:
+            old, new = before.get(metric), after.get(metric)
+            change = round((new - old) / old * 100, 1) if old and new is not None else None
+            rows.append({
+                "endpoint": endpoint,
+                "metric": metric,
+                "baseline": old,
+                "candidate": new,
+                "change_pct": change,
+            })
+
+    return pd.DataFrame(rows)
@@ -1,8 +1,21 @@
 # src/api/main.py
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+from contextlib import contextmanager
+from typing import Literal, Optional, Union
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from pydantic import BaseModel, Field
+from src.api.bulk import (
+    BULK_FORMATS,
+    RequestDrivenStreamingResponse,
+    stream_bulk_predictions,
+)
 from src.core.formwork_engine import run_formwork_engine
+from src.core.tenants import UnknownOwnerError, tenant_cache, tenant_data_dir
+from src.ingest.vocabularies import normalize_category
+from src.kitting.kitting_engine import SCENARIO_OVERRIDES
+from src.kitting.plan_store import KittingPlanStore
+from src.ml.predict import model_state, reload_model
 
 app = FastAPI(
     title="Formwork BoQ AI Engine",
@@ -17,6 +30,14 @@ class ProjectInput(BaseModel):
     area: float
     floors: int
     duration_days: int
+    kitting_solver: Literal["greedy", "min_cost_flow", "partitioned"] = "greedy"
+
+    # Scenario overrides for the kitting re-plan
+    reuse_limit: Optional[int] = Field(None, ge=1)
+    cycle_time_days: Optional[int] = Field(None, ge=1)
+    cycle_time_scale: Optional[float] = Field(None, gt=0)
+    start_day_shift: Optional[int] = None
+    extra_units: Optional[Union[int, dict[str, int]]] = None
 
 
 # 🔹 Health check
@@ -28,4 +49,257 @@ def health_check():
 # 🔹 Core prediction endpoint
 @app.post("/predict-formwork")
 def predict_formwork(data: ProjectInput):
-    return run_formwork_engine(data.dict())
\ No newline at end of file
+    _check_owner(data.owner)
+
+    try:
+        return run_formwork_engine(data.dict())
+    except ValueError as exc:
+        # e.g. extra_units for a formwork type the inventory lacks
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+# 🔹 Bulk scoring: CSV / NDJSON in, NDJSON out (streamed both ways)
+@app.post("/predict-formwork/bulk")
+async def predict_formwork_bulk(
+    request: Request,
+    format: Optional[str] = None,
+    chunk_size: int = Query(1000, ge=1, le=50000)
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "csv" if "csv" in content_type else "ndjson"
+
+    if format not in BULK_FORMATS:
+        raise HTTPException(status_code=422, detail=f"Unsupported format: {format}")
+
+    return RequestDrivenStreamingResponse(
+        stream_bulk_predictions(request.stream(), format, chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+
+# 🔹 Tenants: each owner's requests go to its data partition
+def _check_owner(owner: Optional[str]):
+    try:
+        tenant_data_dir(owner)
+    except UnknownOwnerError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+@contextmanager
+def _tenant(owner: Optional[str]):
+    _check_owner(owner)
+
+    with tenant_cache.checkout(owner) as tenant:
+        yield tenant
+
+
+@app.get("/tenants/metrics")
+def get_tenant_metrics():
+    return tenant_cache.metrics()
+
+
+# 🔹 Admin: publish new state snapshots (in-flight requests keep theirs)
+@app.get("/admin/state")
+def get_state():
+    return {"model": model_state.metrics(), "tenants": tenant_cache.metrics()}
+
+
+@app.post("/admin/reload-model")
+def admin_reload_model():
+    reload_model()
+    return model_state.metrics()
+
+
+@app.post("/admin/reload-data")
+def admin_reload_data(owner: Optional[str] = None):
+    _check_owner(owner)
+    snapshot = tenant_cache.reload(owner)
+    return {"reloaded": snapshot is not None, "version": getattr(snapshot, "version", None)}
+
+
+# 🔹 Stored kitting plans
+def _resolve_plan_id(store: KittingPlanStore, plan_id: str) -> int:
+    if plan_id == "latest":
+        # Scenario plans are what-ifs and event replays carry progress
+        # (COMPLETED tasks); "latest" is the newest baseline
+        resolved = store.latest_plan_id(exclude_params=(*SCENARIO_OVERRIDES, "events"))
+    else:
+        try:
+            resolved = int(plan_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Kitting plan not found")
+
+    if resolved is None or store.get_summary(resolved) is None:
+        raise HTTPException(status_code=404, detail="Kitting plan not found")
+
+    return resolved
+
+
+@app.get("/kitting-plans")
+def list_kitting_plans(owner: Optional[str] = None):
+    with _tenant(owner) as tenant:
+        return tenant.store.list_plans().to_dict(orient="records")
+
+
+@app.get("/kitting-plans/{plan_id}")
+def get_kitting_plan_summary(plan_id: str, owner: Optional[str] = None):
+    with _tenant(owner) as tenant:
+        resolved = _resolve_plan_id(tenant.store, plan_id)
+        return {"plan_id": resolved, **tenant.store.get_summary(resolved)}
+
+
+@app.get("/kitting-plans/{plan_id}/tasks")
+def query_kitting_plan_tasks(
+    plan_id: str,
+    owner: Optional[str] = None,
+    project_id: Optional[str] = None,
+    floor_no: Optional[int] = None,
+    kit_id: Optional[str] = None,
+    status: Optional[str] = None,
+    from_day: Optional[int] = None,
+    to_day: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    with _tenant(owner) as tenant:
+        resolved = _resolve_plan_id(tenant.store, plan_id)
+
+        tasks = tenant.store.query_tasks(
+            resolved,
+            project_id=project_id,
+            floor_no=floor_no,
+            kit_id=kit_id,
+            status=status,
+            from_day=from_day,
+            to_day=to_day,
+            limit=limit
+        )
+
+    # Shortage rows have no kit_id -> emit null, not NaN
+    tasks = tasks.astype(object).where(tasks.notna(), None)
+
+    return {
+        "plan_id": resolved,
+        "count": len(tasks),
+        "tasks": tasks.to_dict(orient="records")
+    }
+
+
+
+# 🔹 Kit availability (interval index over a stored plan)
+def _availability_index(plan_id: str, owner: Optional[str]):
+    with _tenant(owner) as tenant:
+        resolved = _resolve_plan_id(tenant.store, plan_id)
+
+        return tenant.snapshot().availability_index(tenant.store, resolved)
+
+
+def _check_formwork_type(index, formwork_type: str) -> str:
+    """
+    Canonical spelling of the type ("Aluminium" -> "Aluminum"), 404 if
+    the plan's kit pool has no such type
+    """
+    canonical = normalize_category(formwork_type, "formwork_type")
+    if canonical not in index.formwork_types:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown formwork type: {formwork_type}"
+        )
+    return canonical
+
+
+@app.get("/kit-availability/{plan_id}/free")
+def get_free_kits(plan_id: str, formwork_type: str, day: int, owner: Optional[str] = None):
+    index = _availability_index(plan_id, owner)
+    formwork_type = _check_formwork_type(index, formwork_type)
+
+    return {
+        "formwork_type": formwork_type,
+        "day": day,
+        "free_kits": index.free_kits(formwork_type, day)
+    }
+
+
+@app.get("/kit-availability/{plan_id}/range")
+def get_free_kits_range(
+    plan_id: str,
+    formwork_type: str,
+    from_day: int,
+    to_day: int,
+    owner: Optional[str] = None
+):
+    index = _availability_index(plan_id, owner)
+    formwork_type = _check_formwork_type(index, formwork_type)
+
+    if to_day < from_day:
+        raise HTTPException(status_code=422, detail="to_day must be >= from_day")
+
+    return {
+        "formwork_type": formwork_type,
+        "from_day": from_day,
+        "to_day": to_day,
+        **index.free_kits_range(formwork_type, from_day, to_day)
+    }
+
+
+@app.get("/kit-availability/{plan_id}/next-free")
+def get_next_free_day(plan_id: str, formwork_type: str, day: int, owner: Optional[str] = None):
+    index = _availability_index(plan_id, owner)
+    formwork_type = _check_formwork_type(index, formwork_type)
+
+    return {
+        "formwork_type": formwork_type,
+        "day": day,
+        "next_free_day": index.next_free_day(formwork_type, day)
+    }
+
+
+@app.get("/kit-availability/{plan_id}/timeline")
+def get_availability_timeline(
+    plan_id: str,
+    formwork_type: str,
+    from_day: Optional[int] = None,
+    to_day: Optional[int] = None,
+    owner: Optional[str] = None
+):
+    index = _availability_index(plan_id, owner)
+    formwork_type = _check_formwork_type(index, formwork_type)
+
+    timeline = index.timeline(formwork_type, from_day, to_day)
+    return {
+        "formwork_type": formwork_type,
+        "timeline": timeline.astype(int).to_dict(orient="records")
+    }
+
+
+
+# 🔹 Peak demand (sweep line, no allocation)
+@app.get("/peak-demand")
+def get_peak_demand(
+    group_by: Optional[list[str]] = Query(None),
+    owner: Optional[str] = None
+):
+    with _tenant(owner) as tenant:
+        snapshot = tenant.snapshot()
+
+        unknown = set(group_by or []) - set(snapshot.demand_analyzer().tasks.columns)
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown group columns: {sorted(unknown)}"
+            )
+
+        # Cached per snapshot; relabel a copy
+        peaks = snapshot.peak_demand(group_by)
+        capacity = snapshot.capacity()
+
+    peaks = peaks.assign(group=peaks["group"].map(
+        lambda label: " / ".join(map(str, label)) if isinstance(label, tuple) else str(label)
+    ))
+
+    return {
+        "capacity": capacity,
+        "peaks": peaks.to_dict(orient="records")
+    }
@@ -5,10 +5,17 @@ class BoQComparison:
         self.traditional = pd.read_csv(traditional_path)
         self.optimized = pd.read_csv(optimized_path)
 
-    def compare(self):
+    def compare(self, project_ids=None):
+        traditional = self.traditional
+        optimized = self.optimized
+
+        if project_ids is not None:
+            traditional = traditional[traditional["project_id"].isin(project_ids)]
+            optimized = optimized[optimized["project_id"].isin(project_ids)]
+
         df = pd.merge(
-            self.traditional,
-            self.optimized,
+            traditional,
+            optimized,
             on="project_id",
             how="inner"
         )
@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.boq_comparison import BoQComparison
+from src.boq_optimization import OptimizedBoQCalculator
+from src.boq_traditional import TraditionalBoQCalculator
+
+
+class IncrementalBoQRefresh:
+    """
+    Recomputes BoQ summaries only for projects whose rows changed
+    since the last run, and merges them into the existing summary CSVs.
+    Change detection uses per-project digests of the BoQ rows
+    (plus the project row itself), stored next to the summaries.
+    """
+
+    def __init__(
+        self,
+        projects_path,
+        boq_path,
+        traditional_summary_path="data/traditional_boq_summary.csv",
+        optimized_summary_path="data/optimized_boq_summary.csv",
+        comparison_path="data/boq_comparison_summary.csv",
+        digest_path="data/boq_project_digests.csv"
+    ):
+        self.projects_path = projects_path
+        self.boq_path = boq_path
+        self.traditional_summary_path = traditional_summary_path
+        self.optimized_summary_path = optimized_summary_path
+        self.comparison_path = comparison_path
+        self.digest_path = digest_path
+
+    @staticmethod
+    def _row_hashes(df):
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    def project_digests(self, projects, boq) -> pd.Series:
+        """
+        Order-insensitive digest per project: the wrapping uint64 sum
+        of its row hashes, combined with the row count
+        """
+        project_ids = projects["project_id"].unique()
+
+        boq_sums = (
+            pd.Series(self._row_hashes(boq), index=boq["project_id"].to_numpy())
+            .groupby(level=0)
+            .agg(["sum", "size"])
+            .reindex(project_ids, fill_value=0)
+        )
+        project_sums = (
+            pd.Series(self._row_hashes(projects), index=projects["project_id"].to_numpy())
+            .groupby(level=0)
+            .sum()
+            .reindex(project_ids)
+        )
+
+        with np.errstate(over="ignore"):
+            combined = (
+                boq_sums["sum"].to_numpy(dtype=np.uint64)
+                + project_sums.to_numpy(dtype=np.uint64)
+            )
+
+        return pd.Series(
+            [f"{digest:016x}-{size}" for digest, size in zip(combined, boq_sums["size"])],
+            index=project_ids,
+            name="digest"
+        )
+
+    def _previous_digests(self):
+        outputs = [
+            self.digest_path,
+            self.traditional_summary_path,
+            self.optimized_summary_path,
+            self.comparison_path,
+        ]
+        if not all(os.path.exists(path) for path in outputs):
+            return None
+
+        previous = pd.read_csv(self.digest_path, dtype=str)
+        return previous.set_index("project_id")["digest"]
+
+    @staticmethod
+    def _merge(existing_path, fresh, stale_ids, project_order):
+        existing = pd.read_csv(existing_path)
+        merged = pd.concat(
+            [existing[~existing["project_id"].isin(stale_ids)], fresh],
+            ignore_index=True
+        )
+        merged["_order"] = merged["project_id"].map(project_order)
+        return (
+            merged.sort_values("_order", kind="stable")
+            .drop(columns="_order")
+            .reset_index(drop=True)
+        )
+
+    def run(self):
+        projects = pd.read_csv(self.projects_path)
+        boq = pd.read_csv(self.boq_path)
+
+        digests = self.project_digests(projects, boq)
+        previous = self._previous_digests()
+
+        if previous is None:
+            changed = list(digests.index)
+            removed = []
+        else:
+            changed = list(digests.index[digests.ne(previous.reindex(digests.index))])
+            removed = list(previous.index.difference(digests.index))
+
+        stale_ids = set(changed) | set(removed)
+        project_order = {project_id: i for i, project_id in enumerate(digests.index)}
+
+        traditional = TraditionalBoQCalculator(self.projects_path, self.boq_path)
+        optimized = OptimizedBoQCalculator(self.projects_path, self.boq_path)
+
+        traditional_fresh = traditional.calculate_projects(changed)
+        optimized_fresh = optimized.calculate_projects(changed)
+
+        if previous is None:
+            traditional_all = traditional_fresh
+            optimized_all = optimized_fresh
+        else:
+            traditional_all = self._merge(
+                self.traditional_summary_path, traditional_fresh, stale_ids, project_order
+            )
+            optimized_all = self._merge(
+                self.optimized_summary_path, optimized_fresh, stale_ids, project_order
+            )
+
+        traditional_all.to_csv(self.traditional_summary_path, index=False)
+        optimized_all.to_csv(self.optimized_summary_path, index=False)
+
+        comparator = BoQComparison(
+            traditional_path=self.traditional_summary_path,
+            optimized_path=self.optimized_summary_path
+        )
+        comparison_fresh = comparator.compare(project_ids=changed)
+
+        if previous is None:
+            comparison_all = comparison_fresh
+        else:
+            comparison_all = self._merge(
+                self.comparison_path, comparison_fresh, stale_ids, project_order
+            )
+        comparison_all.to_csv(self.comparison_path, index=False)
+
+        digests.rename_axis("project_id").reset_index().to_csv(
+            self.digest_path, index=False
+        )
+
+        return {
+            "projects": len(digests),
+            "recomputed": len(changed),
+            "removed": len(removed),
+            "full_refresh": previous is None
+        }
+
+
+if __name__ == "__main__":
+    refresh = IncrementalBoQRefresh(
+        projects_path="data/projects.csv",
+        boq_path="data/boq_traditional.csv"
+    )
+
+    stats = refresh.run()
+
+    print("\nIncremental BoQ refresh:\n")
+    print(stats)
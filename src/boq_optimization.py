@@ -34,13 +34,16 @@ class OptimizedBoQCalculator:
             "optimized_cost": round(optimized_cost, 2)
         }
 
-    def calculate_all_projects(self):
+    def calculate_projects(self, project_ids):
         results = []
 
-        for project_id in self.projects["project_id"].unique():
+        for project_id in project_ids:
             results.append(self.calculate_project_boq(project_id))
 
-        return pd.DataFrame(results)
+        return pd.DataFrame(results, columns=["project_id", "optimized_quantity", "optimized_cost"])
+
+    def calculate_all_projects(self):
+        return self.calculate_projects(self.projects["project_id"].unique())
 
 
 if __name__ == "__main__":
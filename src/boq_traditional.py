@@ -21,17 +21,23 @@ class TraditionalBoQCalculator:
             "total_cost": round(total_cost, 2)
         }
 
-    def calculate_all_projects(self):
+    def calculate_projects(self, project_ids):
         """
-        Calculates BoQ for all projects
+        Calculates BoQ for the given projects only
         """
         results = []
 
-        for project_id in self.projects["project_id"].unique():
+        for project_id in project_ids:
             result = self.calculate_project_boq(project_id)
             results.append(result)
 
-        return pd.DataFrame(results)
+        return pd.DataFrame(results, columns=["project_id", "total_quantity", "total_cost"])
+
+    def calculate_all_projects(self):
+        """
+        Calculates BoQ for all projects
+        """
+        return self.calculate_projects(self.projects["project_id"].unique())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,435 @@
+"""
+formwork: single entry point for the pipeline steps.
+
+    python -m src.cli <command> [options]
+
+Only argparse and the standard library load at startup; each command
+imports pandas / sklearn / fastapi itself, when it runs.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# command -> heavy modules it imports (measured by `bench`)
+COMMAND_IMPORTS = {
+    "ingest": ["src.ingest.dataset_ingestor"],
+    "generate": ["scripts.generate_mock_data"],
+    "boq": ["src.ingest.dataset_ingestor", "src.boq_traditional", "src.boq_optimization", "src.boq_incremental"],
+    "compare": ["src.boq_comparison"],
+    "inventory": ["src.ingest.dataset_ingestor", "src.inventory_optimizer"],
+    "kit": ["src.ingest.dataset_ingestor", "src.kitting.kitting_engine", "src.kitting.plan_store"],
+    "build-training": ["src.ml.prepare_training_data"],
+    "train": ["src.ml.train_model", "src.ml.incremental_train"],
+    "serve": ["uvicorn", "src.api.main"],
+    "shard": ["src.ingest.dataset_ingestor", "src.sharding.runner"],
+    "worker": ["src.sharding.runner"],
+    "loadtest": ["src.api.loadtest", "uvicorn", "src.api.main"],
+}
+
+
+def _path(args, name):
+    return os.path.join(args.data_dir, name)
+
+
+def _inputs(args, *names):
+    """
+    Paths of the datasets a pipeline command reads: the clean outputs,
+    after the ingest stage has re-run for any raw file that changed
+    (--raw reads the raw CSVs as they are)
+    """
+    if args.raw:
+        return {name: _path(args, f"{name}.csv") for name in names}
+
+    from src.ingest.dataset_ingestor import DatasetIngestor
+
+    ingestor = DatasetIngestor(raw_dir=args.data_dir, clean_dir=_path(args, "clean"))
+    return ingestor.prepare(names)
+
+
+# -----------------------------
+# Commands
+# -----------------------------
+def cmd_ingest(args):
+    from src.ingest.dataset_ingestor import DatasetIngestor
+
+    out_dir = args.out_dir or _path(args, "clean")
+    stats = DatasetIngestor(raw_dir=args.data_dir, clean_dir=out_dir).ingest()
+
+    for name, counts in stats.items():
+        print(f"- {name}: {counts['clean']}/{counts['rows']} clean, {counts['rejected']} rejected")
+    print(f"Saved → {out_dir}")
+
+
+def cmd_generate(args):
+    from scripts.generate_mock_data import generate_mock_data
+
+    generate_mock_data(data_dir=args.data_dir, seed=args.seed)
+
+
+def cmd_boq(args):
+    inputs = _inputs(args, "projects", "boq_traditional")
+    projects_path = inputs["projects"]
+    boq_path = inputs["boq_traditional"]
+
+    if args.incremental:
+        from src.boq_incremental import IncrementalBoQRefresh
+
+        refresh = IncrementalBoQRefresh(
+            projects_path=projects_path,
+            boq_path=boq_path,
+            traditional_summary_path=_path(args, "traditional_boq_summary.csv"),
+            optimized_summary_path=_path(args, "optimized_boq_summary.csv"),
+            comparison_path=_path(args, "boq_comparison_summary.csv"),
+            digest_path=_path(args, "boq_project_digests.csv")
+        )
+        print(refresh.run())
+        return
+
+    from src.boq_optimization import OptimizedBoQCalculator
+    from src.boq_traditional import TraditionalBoQCalculator
+
+    traditional = TraditionalBoQCalculator(projects_path, boq_path).calculate_all_projects()
+    traditional.to_csv(_path(args, "traditional_boq_summary.csv"), index=False)
+
+    optimized = OptimizedBoQCalculator(projects_path, boq_path).calculate_all_projects()
+    optimized.to_csv(_path(args, "optimized_boq_summary.csv"), index=False)
+
+    print(f"Saved → {len(traditional)} traditional / {len(optimized)} optimized project summaries")
+
+
+def cmd_compare(args):
+    from src.boq_comparison import BoQComparison
+
+    comparator = BoQComparison(
+        traditional_path=_path(args, "traditional_boq_summary.csv"),
+        optimized_path=_path(args, "optimized_boq_summary.csv")
+    )
+    result = comparator.save_results(_path(args, "boq_comparison_summary.csv"))
+    print(result.head())
+
+
+def cmd_inventory(args):
+    from src.inventory_optimizer import InventoryOptimizer
+
+    inputs = _inputs(args, "inventory", "boq_optimized")
+    optimizer = InventoryOptimizer(
+        inventory_path=inputs["inventory"],
+        optimized_boq_path=inputs["boq_optimized"]
+    )
+
+    summary = optimizer.calculate_inventory_impact()
+    summary.to_csv(_path(args, "inventory_impact_summary.csv"), index=False)
+
+    if args.bucket_days:
+        time_phased = optimizer.calculate_time_phased_impact(args.bucket_days)
+        time_phased.to_csv(_path(args, "inventory_time_phased_impact.csv"), index=False)
+
+    print(summary["inventory_status"].value_counts().to_string())
+
+
+def cmd_kit(args):
+    from src.kitting.kitting_engine import FormworkKittingEngine
+
+    inputs = _inputs(args, "inventory", "schedule", "boq_traditional")
+    engine = FormworkKittingEngine(
+        inventory_path=inputs["inventory"],
+        schedule_path=inputs["schedule"],
+        boq_path=inputs["boq_traditional"]
+    )
+
+    if args.events:
+        session = engine.start_online_session()
+        print(session.consume_file(args.events))
+        plan = session.current_plan()
+    else:
+        plan = engine.build_kitting_plan(solver=args.solver)
+
+    if args.out:
+        plan.to_csv(args.out, index=False)
+
+    if args.store:
+        from src.kitting.plan_store import KittingPlanStore, plan_key_for
+
+        store = KittingPlanStore(_path(args, "kitting_plans.sqlite"))
+        params = {"solver": args.solver, "events": args.events}
+        # An event replay depends on the events file's contents too
+        paths = engine.input_paths() + ([args.events] if args.events else [])
+        plan_key = plan_key_for(paths, params)
+        plan_id = store.find_plan(plan_key) or store.save_plan(plan_key, plan, params)
+        print(f"Stored plan {plan_id}")
+
+    print(plan["status"].value_counts().to_string())
+
+
+def cmd_build_training(args):
+    from src.ml.prepare_training_data import TrainingDataBuilder
+
+    out = args.out or _path(args, os.path.join("processed", "ml_training_data.csv"))
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+
+    TrainingDataBuilder(data_dir=args.data_dir).build().to_csv(out, index=False)
+    print(f"Saved → {out}")
+
+
+def cmd_train(args):
+    from src.ml.train_model import train_model
+
+    data = args.data or _path(args, os.path.join("processed", "ml_training_data.csv"))
+
+    if args.incremental:
+        import pandas as pd
+
+        from src.ml.incremental_train import IncrementalTrainer
+
+        if args.new_rows:
+            rows = pd.read_csv(args.new_rows)
+        else:
+            from src.ml.prepare_training_data import TrainingDataBuilder
+            rows = TrainingDataBuilder(data_dir=args.data_dir).build()
+
+        trainer = IncrementalTrainer(
+            data_path=data,
+            model_path=args.model,
+            state_dir=args.state_dir,
+            trees_per_update=args.trees_per_update,
+            max_trees=args.max_trees
+        )
+        print(trainer.update(rows))
+        return
+
+    train_model(data_path=data, model_path=args.model)
+
+
+def cmd_serve(args):
+    # Paths are read by src.core.paths at import time
+    os.environ["FORMWORK_DATA_DIR"] = args.data_dir
+    os.environ["FORMWORK_MODEL_PATH"] = args.model
+
+    import uvicorn
+
+    uvicorn.run("src.api.main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+def cmd_shard(args):
+    from src.sharding.jobs import JOBS
+    from src.sharding.runner import run_sharded
+
+    job = JOBS[args.job]
+    inputs = _inputs(args, *job["inputs"], *job["broadcast"])
+
+    result = run_sharded(
+        args.job,
+        data_dir=os.path.dirname(inputs[job["inputs"][0]]),
+        work_dir=args.work_dir or _path(args, os.path.join("shards", args.job)),
+        n_shards=args.shards,
+        workers=args.workers,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        resume=not args.fresh
+    )
+
+    if args.out:
+        result.to_csv(args.out, index=False)
+        print(f"Saved → {args.out}")
+    else:
+        print(result.head())
+
+
+def cmd_worker(args):
+    from src.sharding.runner import run_worker
+
+    processed = run_worker(
+        args.queue_dir,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts
+    )
+    print(f"Processed {processed} task(s)")
+
+
+def cmd_loadtest(args):
+    from src.api.loadtest import (
+        LocalServer,
+        build_payloads,
+        compare_results,
+        parse_mix,
+        run_load,
+        save_results,
+        summarize,
+    )
+
+    if args.compare:
+        print(compare_results(*args.compare).to_string(index=False))
+        return
+
+    payloads = build_payloads(
+        _path(args, "projects.csv"), _path(args, "boq_traditional.csv"), owner=args.owner
+    )
+    config = {
+        "requests": args.requests,
+        "rate": args.rate,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "url": args.url or "local",
+    }
+
+    def run(url):
+        return run_load(
+            url,
+            payloads,
+            requests=args.requests,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            mix=parse_mix(args.mix),
+            warmup=args.warmup
+        )
+
+    if args.url:
+        records = run(args.url)
+    else:
+        os.environ["FORMWORK_DATA_DIR"] = args.data_dir
+        with LocalServer(port=args.port) as server:
+            records = run(server.url)
+
+    summary = summarize(records)
+    print(json.dumps(summary, indent=2))
+    print(f"Saved → {save_results(summary, config, args.out_dir, args.label)}")
+
+
+def _time_subprocess(argv, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def cmd_bench(args):
+    """
+    Per command, median wall time of a fresh process that
+    (a) parses the command line only, (b) also imports the command's
+    dependencies -- i.e. the start-up cost before any real work
+    """
+    python = sys.executable
+    commands = args.commands or list(COMMAND_IMPORTS)
+    unknown = [command for command in commands if command not in COMMAND_IMPORTS]
+    if unknown:
+        raise SystemExit(f"bench: unknown command(s) {unknown}")
+
+    baseline = _time_subprocess([python, "-c", "pass"], args.repeat)
+
+    print(f"{'command':<16}{'cli ms':>10}{'imports ms':>12}")
+    print(f"{'(python)':<16}{baseline:>10.0f}{'':>12}")
+
+    for command in commands:
+        cli_ms = _time_subprocess([python, "-m", "src.cli", command, "--help"], args.repeat)
+        imports = "; ".join(f"import {module}" for module in COMMAND_IMPORTS[command])
+        import_ms = _time_subprocess([python, "-c", imports], args.repeat)
+        print(f"{command:<16}{cli_ms:>10.0f}{import_ms:>12.0f}")
+
+
+# -----------------------------
+# Parser
+# -----------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="formwork", description="Formwork BoQ AI pipeline")
+    parser.add_argument("--data-dir", default=os.environ.get("FORMWORK_DATA_DIR", "data"))
+    parser.add_argument("--raw", action="store_true", help="skip the ingest stage, read the raw CSVs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="validate + normalize raw datasets")
+    p.add_argument("--out-dir", help="clean output dir (default: <data-dir>/clean)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("generate", help="generate mock datasets")
+    p.add_argument("--seed", type=int, default=42)
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser("boq", help="traditional + optimized BoQ summaries")
+    p.add_argument("--incremental", action="store_true", help="recompute changed projects only")
+    p.set_defaults(func=cmd_boq)
+
+    p = sub.add_parser("compare", help="compare traditional vs optimized BoQ")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("inventory", help="inventory impact summary")
+    p.add_argument("--bucket-days", type=int, default=7, help="time-phased bucket size (0 to skip)")
+    p.set_defaults(func=cmd_inventory)
+
+    p = sub.add_parser("kit", help="build a kitting plan")
+    p.add_argument("--solver", default="greedy", choices=["greedy", "min_cost_flow", "partitioned"])
+    p.add_argument("--events", help="NDJSON schedule events to replay (online mode)")
+    p.add_argument("--out", help="write the plan to this CSV")
+    p.add_argument("--store", action="store_true", help="save the plan in the plan store")
+    p.set_defaults(func=cmd_kit)
+
+    p = sub.add_parser("build-training", help="build the ML training dataset")
+    p.add_argument("--out", help="default: <data-dir>/processed/ml_training_data.csv")
+    p.set_defaults(func=cmd_build_training)
+
+    p = sub.add_parser("train", help="train the demand model")
+    p.add_argument("--data", help="default: <data-dir>/processed/ml_training_data.csv")
+    p.add_argument("--model", default=os.environ.get("FORMWORK_MODEL_PATH", "models/formwork_demand_model.pkl"))
+    p.add_argument("--incremental", action="store_true", help="add trees for unseen rows instead of refitting")
+    p.add_argument("--new-rows", help="CSV of new training rows (default: rebuilt from <data-dir>)")
+    p.add_argument("--state-dir", default="models/incremental")
+    p.add_argument("--trees-per-update", type=int, default=20)
+    p.add_argument("--max-trees", type=int, default=400)
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser("serve", help="run the API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--model", default=os.environ.get("FORMWORK_MODEL_PATH", "models/formwork_demand_model.pkl"))
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("shard", help="run a job sharded by project over worker processes")
+    p.add_argument("job", choices=["boq_traditional", "boq_optimized", "inventory_impact"])
+    p.add_argument("--shards", type=int, default=8)
+    p.add_argument("--workers", type=int, default=4, help="local worker processes (0: run inline)")
+    p.add_argument("--work-dir", help="shared dir for shards + queue (default: <data-dir>/shards/<job>)")
+    p.add_argument("--lease-seconds", type=int, default=60)
+    p.add_argument("--max-attempts", type=int, default=3)
+    p.add_argument("--fresh", action="store_true", help="recompute every shard, even unchanged ones")
+    p.add_argument("--out", help="write the reduced result to this CSV")
+    p.set_defaults(func=cmd_shard)
+
+    p = sub.add_parser("worker", help="drain a shard queue (run on any node sharing the work dir)")
+    p.add_argument("queue_dir", help="<work-dir>/queue")
+    p.add_argument("--lease-seconds", type=int, default=60)
+    p.add_argument("--max-attempts", type=int, default=3)
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("loadtest", help="replay project payloads against the API, report latency percentiles")
+    p.add_argument("--url", help="target a running API instead of starting one locally")
+    p.add_argument("--port", type=int, default=8765, help="port for the local server")
+    p.add_argument("--owner", default="loadtest", help="owner sent in payloads (must be known to the API)")
+    p.add_argument("--requests", type=int, default=500)
+    p.add_argument("--rate", type=float, help="requests per second (default: closed loop)")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--mix", default="predict=1", help="endpoint weights, e.g. predict=8,plans=1,peak_demand=1")
+    p.add_argument("--warmup", type=int, default=5)
+    p.add_argument("--label", help="name for the saved run (default: git revision)")
+    p.add_argument("--out-dir", default="loadtest_results")
+    p.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="compare two saved runs")
+    p.set_defaults(func=cmd_loadtest)
+
+    p = sub.add_parser("bench", help="measure start-up time per command")
+    p.add_argument("commands", nargs="*", metavar="command", help=f"any of {', '.join(COMMAND_IMPORTS)}")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
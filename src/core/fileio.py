@@ -0,0 +1,18 @@
+import os
+import uuid
+
+
+def atomic_write(path, write):
+    """
+    write(tmp) into a uniquely named file next to path, then rename it
+    over path: readers see the old file or the new one, never a
+    partial one, and concurrent writers never share a temp file
+    """
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
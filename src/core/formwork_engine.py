@@ -1,5 +1,39 @@
+from src.core.tenants import tenant_cache
 from src.ml.predict import predict_formwork
-from src.kitting.kitting_engine import FormworkKittingEngine
+from src.kitting.kitting_engine import scenario_overrides
+from src.kitting.plan_store import plan_key_for
+
+
+def _kitting_summary(store, engine, solver, capacity, overrides=None):
+    """
+    Stored plan if the inputs are unchanged; otherwise skip allocation
+    when the sweep-line verdict fixes the counts exactly; otherwise
+    allocate and store. A guaranteed shortage only bounds the count,
+    so it still allocates and reports the bound alongside.
+    """
+    # Scenario overrides are part of the plan identity
+    params = {"solver": solver, **(overrides or {})}
+    plan_key = plan_key_for(engine.input_paths(), params)
+    plan_id = store.find_plan(plan_key)
+
+    if plan_id is None:
+        # The shortage-free proof covers the greedy allocator only
+        if capacity["verdict"] == "SHORTAGE_FREE" and solver == "greedy":
+            total_tasks = capacity["total_tasks"]
+            return None, {
+                "total_tasks": total_tasks,
+                "allocated": total_tasks,
+                "shortages": 0
+            }
+
+        kitting_plan = engine.build_kitting_plan(solver=solver, overrides=overrides)
+        plan_id = store.save_plan(plan_key, kitting_plan, params)
+
+    summary = store.get_summary(plan_id)
+    if capacity["verdict"] == "GUARANTEED_SHORTAGE":
+        summary["shortages_lower_bound"] = capacity["shortages_lower_bound"]
+
+    return plan_id, summary
 
 
 def run_formwork_engine(payload: dict):
@@ -11,19 +45,40 @@ def run_formwork_engine(payload: dict):
     # ML prediction
     prediction = predict_formwork(payload)
 
-    # Kitting logic
-    engine = FormworkKittingEngine(
-        inventory_path="data/inventory.csv",
-        schedule_path="data/schedule.csv"
-    )
+    # Kitting logic, on the owner's data partition (warm if cached);
+    # scenario overrides re-plan from the cached inputs
+    solver = payload.get("kitting_solver") or "greedy"
+    overrides = scenario_overrides(payload)
+
+    with tenant_cache.checkout(payload.get("owner")) as tenant:
+        # One consistent snapshot for the whole request
+        snapshot = tenant.snapshot()
+        capacity = snapshot.capacity(overrides)
+
+        def summary_for(needed):
+            return snapshot.summary(
+                needed,
+                overrides,
+                lambda: _kitting_summary(tenant.store, snapshot.engine, needed, capacity, overrides)
+            )
+
+        plan_id, summary = summary_for(solver)
+        summary = dict(summary)
+
+        if solver != "greedy":
+            _, greedy_summary = summary_for("greedy")
+            summary["shortage_reduction_vs_greedy"] = (
+                greedy_summary["shortages"] - summary["shortages"]
+            )
 
-    kitting_plan = engine.build_kitting_plan()
+        data_partition = tenant.partition
 
     return {
         "predicted_new_units": int(round(prediction)),
-        "kitting_summary": {
-            "total_tasks": len(kitting_plan),
-            "allocated": int((kitting_plan["status"] == "ALLOCATED").sum()),
-            "shortages": int((kitting_plan["status"] == "SHORTAGE").sum())
-        }
-    }
\ No newline at end of file
+        "kitting_solver": solver,
+        "scenario_overrides": overrides,
+        "kitting_plan_id": plan_id,
+        "data_partition": data_partition,
+        "capacity_verdict": capacity["verdict"],
+        "kitting_summary": summary
+    }
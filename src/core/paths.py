@@ -0,0 +1,9 @@
+import os
+
+# Overridable so the CLI / workers can point at other data sets
+DATA_DIR = os.environ.get("FORMWORK_DATA_DIR", "data")
+MODEL_PATH = os.environ.get("FORMWORK_MODEL_PATH", "models/formwork_demand_model.pkl")
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
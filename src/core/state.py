@@ -0,0 +1,83 @@
+import threading
+import weakref
+
+import numpy as np
+
+
+def freeze(value):
+    """
+    Make numpy arrays read-only so a snapshot cannot be edited in place.
+    (pandas frames are copy-on-write: derived frames never write back.)
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+class Snapshot:
+    """
+    Immutable bundle of shared state. Readers keep a reference for as
+    long as they need a consistent view; once replaced, a snapshot is
+    freed when its last reader drops it.
+    """
+
+    def __init__(self, version, **values):
+        object.__setattr__(self, "version", version)
+        for name, value in values.items():
+            object.__setattr__(self, name, freeze(value))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshots are read-only; publish a new one instead")
+
+
+class SnapshotHolder:
+    """
+    Copy-on-write holder. current() is a single attribute read, so
+    readers never lock and never see a half-built state. publish()
+    builds the next snapshot from the previous one under a writer
+    lock and swaps it in atomically.
+
+    build(previous) -> dict of snapshot values
+    """
+
+    def __init__(self, build, snapshot_cls=Snapshot):
+        self._build = build
+        self._snapshot_cls = snapshot_cls
+        self._current = None
+        self._write_lock = threading.Lock()
+        self._live = weakref.WeakSet()
+        self.published = 0
+
+    def current(self):
+        snapshot = self._current
+        if snapshot is None:
+            with self._write_lock:
+                # First reader builds it; readers that queued behind reuse it
+                if self._current is None:
+                    self._publish_locked(self._build)
+                snapshot = self._current
+        return snapshot
+
+    def publish(self, build=None):
+        with self._write_lock:
+            return self._publish_locked(build or self._build)
+
+    def _publish_locked(self, build):
+        previous = self._current
+        version = previous.version + 1 if previous is not None else 1
+
+        snapshot = self._snapshot_cls(version, **build(previous))
+        self._live.add(snapshot)
+
+        self._current = snapshot
+        self.published += 1
+        return snapshot
+
+    def metrics(self):
+        snapshot = self._current
+        return {
+            "version": snapshot.version if snapshot is not None else None,
+            "published": self.published,
+            # Current one + old ones some reader still holds
+            "live_snapshots": len(self._live),
+        }
@@ -0,0 +1,312 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.core.paths import DATA_DIR
+from src.core.state import Snapshot, SnapshotHolder
+from src.ingest.dataset_ingestor import DatasetIngestor
+from src.kitting.demand_analyzer import PeakDemandAnalyzer
+from src.kitting.kitting_engine import FormworkKittingEngine, scenario_overrides
+from src.kitting.plan_store import KittingPlanStore
+
+TENANTS_DIR = os.path.join(DATA_DIR, "tenants")
+DEFAULT_CACHE_BYTES = int(os.environ.get("FORMWORK_TENANT_CACHE_MB", "512")) * 1024 * 1024
+
+# Owner names become directory names: "L&T Build" -> "l-t-build"
+UNSAFE_CHARS = re.compile(r"[^a-z0-9_.-]+")
+
+INPUT_DATASETS = ("inventory", "schedule", "boq_traditional")
+
+
+class UnknownOwnerError(LookupError):
+    pass
+
+
+def owner_slug(owner):
+    slug = UNSAFE_CHARS.sub("-", owner.strip().lower()).strip("-.")[:64]
+    if not slug:
+        raise ValueError(f"Invalid owner name: {owner!r}")
+    return slug
+
+
+# Strict mode: only owners with a partition (or listed in
+# FORMWORK_DEFAULT_OWNERS, e.g. "acme,L&T Build") are served
+STRICT_OWNERS = os.environ.get("FORMWORK_STRICT_OWNERS", "0") == "1"
+DEFAULT_OWNERS = frozenset(
+    owner_slug(owner)
+    for owner in os.environ.get("FORMWORK_DEFAULT_OWNERS", "").split(",")
+    if owner.strip()
+)
+
+
+def tenant_data_dir(owner):
+    """
+    data/tenants/<owner slug>/ when the owner has a partition, else
+    the shared data directory. With FORMWORK_STRICT_OWNERS=1 only
+    owners listed in FORMWORK_DEFAULT_OWNERS fall back to it; any
+    other owner is unknown, so a typo never reads or writes the
+    shared plans.
+    """
+    if owner is None:
+        return DATA_DIR
+
+    slug = owner_slug(owner)
+    partition = os.path.join(TENANTS_DIR, slug)
+
+    if os.path.isdir(partition):
+        return partition
+    if not STRICT_OWNERS or slug in DEFAULT_OWNERS:
+        return DATA_DIR
+
+    raise UnknownOwnerError(f"Unknown owner: {owner!r}")
+
+
+def scenario_key(overrides):
+    return json.dumps(overrides or {}, sort_keys=True)
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum()) if df is not None else 0
+
+
+class TenantSnapshot(Snapshot):
+    """
+    One published version of a partition: the warmed engine plus
+    memo caches of results derived from exactly these inputs. The
+    caches only ever gain entries (one dict store each), so readers
+    share them without locking; cheap entries may be computed twice.
+    Kitting summaries allocate and write the plan store, so each is
+    computed once, under a lock of its own.
+    """
+
+    def summary(self, solver, overrides, compute):
+        key = (solver, scenario_key(overrides))
+        if key not in self.summaries:
+            # setdefault is atomic: all readers of a key share one lock
+            with self.summary_locks.setdefault(key, threading.Lock()):
+                if key not in self.summaries:
+                    self.summaries[key] = compute()
+        return self.summaries[key]
+
+    def capacity(self, overrides=None):
+        key = scenario_key(overrides)
+        if key not in self.capacities:
+            self.capacities[key] = self.engine.assess_capacity(overrides)
+        return self.capacities[key]
+
+    def demand_analyzer(self):
+        # BoQ lines are schedule rows + formwork_type (clean, ingested)
+        path = self.engine.boq_path
+        if path not in self.demand_analyzers:
+            self.demand_analyzers[path] = PeakDemandAnalyzer(pd.read_csv(path))
+        return self.demand_analyzers[path]
+
+    def peak_demand(self, group_by=None):
+        key = None if group_by is None else tuple(group_by)
+        if key not in self.peak_demands:
+            self.peak_demands[key] = self.demand_analyzer().peak_demand(group_by)
+        return self.peak_demands[key]
+
+    def load_plan(self, store, plan_id):
+        if plan_id not in self.plans:
+            self.plans[plan_id] = store.load_plan(plan_id)
+        return self.plans[plan_id]
+
+    def availability_index(self, store, plan_id):
+        if plan_id not in self.availability_indexes:
+            # Index the kit pool the plan was allocated from
+            overrides = scenario_overrides(store.get_params(plan_id))
+            self.availability_indexes[plan_id] = self.engine.build_availability_index(
+                self.load_plan(store, plan_id), overrides
+            )
+        return self.availability_indexes[plan_id]
+
+    def nbytes(self):
+        """
+        Estimated resident size: parsed inputs + cached plans / indexes
+        """
+        total = _frame_bytes(self.engine.inventory) + _frame_bytes(self.engine.schedule)
+        total += sum(_frame_bytes(analyzer.tasks) for analyzer in list(self.demand_analyzers.values()))
+        total += sum(_frame_bytes(plan) for plan in list(self.plans.values()))
+        total += sum(index.nbytes for index in list(self.availability_indexes.values()))
+        return total
+
+
+class TenantContext:
+    """
+    One data partition: its plan store and a snapshot holder for the
+    parsed inputs. A reload publishes a new snapshot; requests that
+    started on the old one finish on it.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.store = KittingPlanStore(self.path("kitting_plans.sqlite"))
+        self.state = SnapshotHolder(self._load, snapshot_cls=TenantSnapshot)
+
+    def _load(self, previous):
+        signature = self._input_signature()
+
+        # The engine reads the ingest stage's clean outputs, re-ingesting
+        # whichever raw input changed
+        ingestor = DatasetIngestor(raw_dir=self.data_dir, clean_dir=self.path("clean"))
+        inputs = ingestor.prepare(INPUT_DATASETS)
+
+        engine = FormworkKittingEngine(
+            inventory_path=inputs["inventory"],
+            schedule_path=inputs["schedule"],
+            boq_path=inputs["boq_traditional"]
+        )
+        engine.warm()
+
+        return {
+            "engine": engine,
+            "signature": signature,
+            "capacities": {},            # scenario key -> capacity verdict
+            "demand_analyzers": {},      # BoQ path -> PeakDemandAnalyzer
+            "peak_demands": {},          # group columns -> peaks frame
+            "summaries": {},             # (solver, scenario key) -> (plan_id, summary)
+            "summary_locks": {},         # (solver, scenario key) -> Lock
+            "plans": {},                 # plan_id -> plan frame
+            "availability_indexes": {},  # plan_id -> KitAvailabilityIndex
+        }
+
+    @property
+    def partition(self):
+        return "default" if self.data_dir == DATA_DIR else os.path.basename(self.data_dir)
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def _input_signature(self):
+        signature = []
+        for name in INPUT_DATASETS:
+            try:
+                stat = os.stat(self.path(f"{name}.csv"))
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def snapshot(self):
+        return self.state.current()
+
+    def is_stale(self):
+        return self._input_signature() != self.snapshot().signature
+
+    def reload(self):
+        return self.state.publish()
+
+    def nbytes(self):
+        return self.snapshot().nbytes()
+
+
+class TenantEngineCache:
+    """
+    Memory-bounded LRU of TenantContexts keyed by data directory.
+    Owners mapped to the shared data directory share its context.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # data_dir -> (context, nbytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    @contextmanager
+    def checkout(self, owner=None):
+        """
+        Yields the owner's context; its size is re-measured on exit
+        since requests add plans / indexes to it
+        """
+        data_dir = tenant_data_dir(owner)
+
+        with self._lock:
+            entry = self._entries.get(data_dir)
+
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(data_dir)
+                context = entry[0]
+            else:
+                self.misses += 1
+                context = None
+
+        if context is None:
+            # Parse outside the cache lock so other tenants are not blocked
+            context = TenantContext(data_dir)
+            context.snapshot()
+        elif context.is_stale():
+            # Inputs changed on disk: publish a fresh snapshot
+            context.reload()
+            with self._lock:
+                self.reloads += 1
+
+        try:
+            yield context
+        finally:
+            self._admit(data_dir, context)
+
+    def _admit(self, data_dir, context):
+        nbytes = context.nbytes()
+
+        with self._lock:
+            self._entries[data_dir] = (context, nbytes)
+            self._entries.move_to_end(data_dir)
+
+            # Keep the entry just used, even if it alone exceeds the budget
+            while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def total_bytes(self):
+        return sum(nbytes for _, nbytes in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reload(self, owner=None):
+        """
+        Re-read the owner's inputs now (no-op if not resident)
+        """
+        data_dir = tenant_data_dir(owner)
+        with self._lock:
+            entry = self._entries.get(data_dir)
+
+        if entry is None:
+            return None
+
+        snapshot = entry[0].reload()
+        with self._lock:
+            self.reloads += 1
+        return snapshot
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "tenants": len(self._entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+                "resident": [
+                    {"data_dir": data_dir, "bytes": nbytes, **context.state.metrics()}
+                    for data_dir, (context, nbytes) in reversed(self._entries.items())
+                ]
+            }
+
+
+tenant_cache = TenantEngineCache()
@@ -0,0 +1,208 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.core.fileio import atomic_write
+from src.ingest.vocabularies import encode_categories
+
+# column -> (kind, min, max); kind is "str", "int", "float" or "category"
+TASK_COLUMNS = {
+    "project_id": ("str", None, None),
+    "floor_no": ("int", 0, 500),
+    "element_type": ("category", None, None),
+    "planned_start_day": ("int", 0, None),
+    "cycle_time_days": ("int", 1, 365),
+    "actual_start_day": ("int", None, None),
+}
+
+BOQ_COLUMNS = {
+    **TASK_COLUMNS,
+    "formwork_type": ("category", None, None),
+    "area_sqm": ("float", 0.01, None),
+    "quantity": ("int", 0, None),
+    "cost_per_sqm": ("float", 0.01, None),
+    "total_cost": ("float", 0, None),
+}
+
+SCHEMAS = {
+    "projects": {
+        "project_id": ("str", None, None),
+        "project_type": ("category", None, None),
+        "floors": ("int", 1, 500),
+        "location": ("category", None, None),
+        "start_day": ("int", 0, None),
+    },
+    "inventory": {
+        "formwork_type": ("category", None, None),
+        "unit_area_sqm": ("float", 0.01, None),
+        "total_units": ("int", 0, None),
+        "reuse_limit": ("int", 1, None),
+    },
+    "schedule": TASK_COLUMNS,
+    "boq_traditional": BOQ_COLUMNS,
+    "boq_optimized": {
+        **BOQ_COLUMNS,
+        "optimized_quantity": ("int", 0, None),
+        "optimized_cost": ("float", 0, None),
+        "cost_saving": ("float", None, None),
+    },
+}
+
+
+class DatasetIngestor:
+    """
+    Validation + normalization stage in front of the pipelines.
+    Every check is a column-wide mask; rows failing any check are
+    written to a rejected-rows report instead of the clean output.
+    """
+
+    def __init__(self, raw_dir="data", clean_dir="data/clean"):
+        self.raw_dir = raw_dir
+        self.clean_dir = clean_dir
+
+    def validate(self, name, df: pd.DataFrame):
+        """
+        Returns (clean typed frame, rejected rows report)
+        """
+        schema = SCHEMAS[name]
+
+        missing = [col for col in schema if col not in df.columns]
+        if missing:
+            raise ValueError(f"{name}: missing columns {missing}")
+
+        clean = {}
+        failures = []
+
+        for col, (kind, low, high) in schema.items():
+            raw = df[col]
+
+            if kind == "category":
+                values = encode_categories(raw, col)
+                bad = np.asarray(values.codes == -1)
+                reason = "unknown category"
+            elif kind == "str":
+                values = raw.astype("string").str.strip()
+                bad = (values.isna() | (values == "")).to_numpy(dtype=bool)
+                reason = "missing value"
+            else:
+                values = pd.to_numeric(raw, errors="coerce")
+                bad = values.isna().to_numpy()
+                reason = "not a number"
+
+                if kind == "int":
+                    fractional = (values % 1 != 0).to_numpy() & ~bad
+                    failures.append((col, fractional, "not an integer"))
+                if low is not None:
+                    failures.append((col, (values < low).to_numpy(), f"below {low}"))
+                if high is not None:
+                    failures.append((col, (values > high).to_numpy(), f"above {high}"))
+
+            failures.append((col, bad, reason))
+            clean[col] = values
+
+        rejected_mask = np.zeros(len(df), dtype=bool)
+        report = []
+        for col, mask, reason in failures:
+            if mask.any():
+                rejected_mask |= mask
+                rows = np.flatnonzero(mask)
+                report.append(pd.DataFrame({
+                    "dataset": name,
+                    "row": rows,
+                    "column": col,
+                    "reason": reason,
+                    "value": df[col].to_numpy()[rows].astype(str),
+                }))
+
+        # Columns outside the schema (e.g. an inventory location) pass through
+        extra = {col: df[col] for col in df.columns if col not in schema}
+        clean_df = pd.DataFrame({**clean, **extra})[~rejected_mask].reset_index(drop=True)
+        for col, (kind, _, _) in schema.items():
+            if kind == "int":
+                clean_df[col] = clean_df[col].astype("int64")
+            elif kind == "float":
+                clean_df[col] = clean_df[col].astype("float64")
+
+        report_df = (
+            pd.concat(report, ignore_index=True).sort_values(["row", "column"])
+            if report
+            else pd.DataFrame(columns=["dataset", "row", "column", "reason", "value"])
+        )
+        return clean_df, report_df
+
+    def clean_path(self, name):
+        return os.path.join(self.clean_dir, f"{name}.csv")
+
+    def _write(self, df, path):
+        # A reload may read clean files while another load writes them
+        atomic_write(path, lambda tmp: df.to_csv(tmp, index=False))
+
+    def ingest(self, names=None):
+        """
+        Validate raw CSVs and write clean CSVs + rejected_rows.csv
+        (rows of datasets not ingested this time are kept in the report)
+        """
+        names = list(SCHEMAS) if names is None else names
+        os.makedirs(self.clean_dir, exist_ok=True)
+
+        reports = []
+        stats = {}
+        for name in names:
+            raw = pd.read_csv(os.path.join(self.raw_dir, f"{name}.csv"))
+            clean, report = self.validate(name, raw)
+
+            self._write(clean, self.clean_path(name))
+            reports.append(report)
+            stats[name] = {
+                "rows": len(raw),
+                "clean": len(clean),
+                "rejected": len(raw) - len(clean),
+            }
+
+        report_path = os.path.join(self.clean_dir, "rejected_rows.csv")
+        if os.path.exists(report_path):
+            previous = pd.read_csv(report_path)
+            reports.insert(0, previous[~previous["dataset"].isin(names)])
+
+        self._write(pd.concat(reports, ignore_index=True), report_path)
+        return stats
+
+    def prepare(self, names):
+        """
+        Clean paths for the named datasets, ingesting those whose clean
+        output is missing or older than the raw file. Pipelines call
+        this instead of reading the raw CSVs.
+        """
+        stale = [
+            name for name in names
+            if not os.path.exists(self.clean_path(name))
+            or os.path.getmtime(self.clean_path(name))
+            < os.path.getmtime(os.path.join(self.raw_dir, f"{name}.csv"))
+        ]
+        if stale:
+            self.ingest(stale)
+
+        return {name: self.clean_path(name) for name in names}
+
+    def load_clean(self, name) -> pd.DataFrame:
+        """
+        Read a clean output back with its schema types
+        """
+        schema = SCHEMAS[name]
+        dtypes = {
+            col: {"int": "int64", "float": "float64", "str": "string", "category": "category"}[kind]
+            for col, (kind, _, _) in schema.items()
+        }
+        return pd.read_csv(self.clean_path(name), dtype=dtypes)
+
+
+if __name__ == "__main__":
+    ingestor = DatasetIngestor()
+    stats = ingestor.ingest()
+
+    print("\nIngest summary:\n")
+    for name, counts in stats.items():
+        print(f"- {name}: {counts['clean']}/{counts['rows']} clean, {counts['rejected']} rejected")
+
+    print("\nSaved → data/clean/ (rejected_rows.csv lists every rejected row)")
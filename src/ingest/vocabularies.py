@@ -0,0 +1,84 @@
+import pandas as pd
+
+# Canonical values are the spellings the datasets and the trained
+# model use; aliases cover the UI labels and common variants.
+VOCABULARIES = {
+    "formwork_type": {
+        "Steel": ["steel", "ms", "mild steel"],
+        "Aluminum": ["aluminum", "aluminium", "alu"],
+        "Timber": ["timber", "wood", "wooden"],
+    },
+    "project_type": {
+        "Residential": ["residential", "housing"],
+        "Commercial": ["commercial"],
+        # Not an alias of "infrastructure": those are different project
+        # types, and infrastructure rows go to the rejected-rows report
+        "Industrial": ["industrial"],
+    },
+    "element_type": {
+        "Column": ["column", "columns"],
+        "Beam": ["beam", "beams"],
+        "Slab": ["slab", "slabs"],
+        "Wall": ["wall", "walls"],
+    },
+    "location": {
+        "Metro": ["metro"],
+        "Tier-1": ["tier-1", "tier 1", "tier1"],
+        "Tier-2": ["tier-2", "tier 2", "tier2"],
+    },
+}
+
+
+def _compile(vocabulary):
+    """
+    Alias -> category code lookup, built once at import
+    """
+    categories = list(vocabulary)
+    lookup = {}
+    for code, canonical in enumerate(categories):
+        for alias in [canonical, *vocabulary[canonical]]:
+            lookup[alias.strip().lower()] = code
+    return categories, lookup
+
+
+CODE_TABLES = {field: _compile(vocab) for field, vocab in VOCABULARIES.items()}
+
+
+def encode_categories(values: pd.Series, field: str) -> pd.Categorical:
+    """
+    Vectorized alias mapping. Only the distinct raw values go through
+    the lookup; rows pick their code by position. Unknown values
+    come back as NaN.
+    """
+    categories, lookup = CODE_TABLES[field]
+    raw_codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+    if len(uniques) == 0:
+        return pd.Categorical.from_codes([-1] * len(values), categories=categories)
+
+    unique_codes = pd.Series(uniques).astype(str).str.strip().str.lower().map(lookup)
+    unique_codes = unique_codes.fillna(-1).astype("int64").to_numpy()
+
+    codes = unique_codes.take(raw_codes, mode="clip")
+    codes[raw_codes < 0] = -1
+
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def normalize_category(value, field: str):
+    """
+    Single-value form for request payloads; unknown values pass through
+    """
+    if value is None or field not in CODE_TABLES:
+        return value
+
+    categories, lookup = CODE_TABLES[field]
+    code = lookup.get(str(value).strip().lower())
+    return value if code is None else categories[code]
+
+
+def normalize_payload(payload: dict) -> dict:
+    return {
+        key: normalize_category(value, key) if key in CODE_TABLES else value
+        for key, value in payload.items()
+    }
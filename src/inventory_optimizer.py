@@ -1,46 +1,100 @@
+import numpy as np
 import pandas as pd
 
 
 class InventoryOptimizer:
-    def __init__(self, inventory_path, optimized_boq_path):
+    def __init__(self, inventory_path, optimized_boq_path=None):
         self.inventory = pd.read_csv(inventory_path)
-        self.optimized_boq = pd.read_csv(optimized_boq_path)
+        # None when the required areas come from elsewhere (sharded reduce)
+        self.optimized_boq = pd.read_csv(optimized_boq_path) if optimized_boq_path else None
 
-    def calculate_inventory_impact(self):
-        results = []
+    def required_area_by_type(self):
+        """
+        Total required area per formwork type from the optimized BoQ
+        """
+        return self.optimized_boq.groupby("formwork_type")["area_sqm"].sum()
 
-        for _, inv in self.inventory.iterrows():
-            formwork_type = inv["formwork_type"]
+    def calculate_inventory_impact(self, required_by_type=None):
+        inventory = self.inventory
 
-            # Total reusable area available
-            available_area = (
-                inv["total_units"]
-                * inv["unit_area_sqm"]
-                * inv["reuse_limit"]
+        if required_by_type is None:
+            required_by_type = self.required_area_by_type()
+
+        # Total reusable area available
+        available_area = (
+            inventory["total_units"]
+            * inventory["unit_area_sqm"]
+            * inventory["reuse_limit"]
+        )
+
+        # Required area per inventory row's formwork type
+        required_area = inventory["formwork_type"].map(required_by_type).fillna(0)
+
+        shortage_area = (required_area - available_area).clip(lower=0)
+        surplus_area = (available_area - required_area).clip(lower=0)
+
+        return pd.DataFrame({
+            "formwork_type": inventory["formwork_type"],
+            "available_area_sqm": available_area.round(2),
+            "required_area_sqm": required_area.round(2),
+            "shortage_area_sqm": shortage_area.round(2),
+            "surplus_area_sqm": surplus_area.round(2),
+            "inventory_status": np.where(
+                shortage_area == 0, "Sufficient", "Purchase Required"
             )
+        })
+
+    def calculate_time_phased_impact(self, bucket_days=7):
+        """
+        Shortage / surplus curves per formwork type and day bucket.
+        Each BoQ line occupies its area from planned_start_day for
+        cycle_time_days; the bucket value is the peak daily area in
+        use, compared against the area the yard can field at once.
+        """
+        boq = self.optimized_boq
+
+        formwork_types = pd.Index(
+            pd.unique(pd.concat([self.inventory["formwork_type"], boq["formwork_type"]]))
+        )
+        type_codes = formwork_types.get_indexer(boq["formwork_type"])
+
+        start_days = boq["planned_start_day"].to_numpy(dtype=np.int64)
+        end_days = start_days + boq["cycle_time_days"].to_numpy(dtype=np.int64)
+        area = boq["area_sqm"].to_numpy(dtype=float)
 
-            # Total required area from optimized BoQ
-            required_area = self.optimized_boq[
-                self.optimized_boq["formwork_type"] == formwork_type
-            ]["area_sqm"].sum()
+        n_types = len(formwork_types)
+        n_buckets = int(end_days.max(initial=0)) // bucket_days + 1
+        n_days = n_buckets * bucket_days
 
-            shortage_area = max(0, required_area - available_area)
-            surplus_area = max(0, available_area - required_area)
+        # Sweep line: +area at start, -area at end, cumulative sum per type
+        size = n_types * n_days
+        in_use = (
+            np.bincount(type_codes * n_days + start_days, weights=area, minlength=size)
+            - np.bincount(type_codes * n_days + end_days, weights=area, minlength=size)
+        ).reshape(n_types, n_days).cumsum(axis=1)
 
-            results.append({
-                "formwork_type": formwork_type,
-                "available_area_sqm": round(available_area, 2),
-                "required_area_sqm": round(required_area, 2),
-                "shortage_area_sqm": round(shortage_area, 2),
-                "surplus_area_sqm": round(surplus_area, 2),
-                "inventory_status": (
-                    "Sufficient"
-                    if shortage_area == 0
-                    else "Purchase Required"
-                )
-            })
+        required = in_use.reshape(n_types, n_buckets, bucket_days).max(axis=2)
 
-        return pd.DataFrame(results)
+        available_by_type = (
+            (self.inventory["total_units"] * self.inventory["unit_area_sqm"])
+            .groupby(self.inventory["formwork_type"])
+            .sum()
+            .reindex(formwork_types, fill_value=0)
+            .to_numpy()
+        )
+        available = np.broadcast_to(available_by_type[:, None], required.shape)
+
+        bucket_start = np.arange(n_buckets) * bucket_days
+
+        return pd.DataFrame({
+            "formwork_type": np.repeat(formwork_types.to_numpy(), n_buckets),
+            "bucket_start_day": np.tile(bucket_start, n_types),
+            "bucket_end_day": np.tile(bucket_start + bucket_days - 1, n_types),
+            "required_area_sqm": required.ravel().round(2),
+            "available_area_sqm": available.ravel().round(2),
+            "shortage_area_sqm": np.clip(required - available, 0, None).ravel().round(2),
+            "surplus_area_sqm": np.clip(available - required, 0, None).ravel().round(2),
+        })
 
 
 if __name__ == "__main__":
@@ -59,4 +113,13 @@ if __name__ == "__main__":
         index=False
     )
 
-    print("\nSaved → data/inventory_impact_summary.csv")
\ No newline at end of file
+    print("\nSaved → data/inventory_impact_summary.csv")
+
+    time_phased = optimizer.calculate_time_phased_impact()
+
+    time_phased.to_csv(
+        "data/inventory_time_phased_impact.csv",
+        index=False
+    )
+
+    print("Saved → data/inventory_time_phased_impact.csv")
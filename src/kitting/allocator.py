@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+NEVER = float("inf")
+
+
+class KitAllocator:
+    """
+    Greedy kit allocator backed by a min segment tree over
+    available_from_day (exhausted kits hold NEVER).
+    "First kit in pool order free by day d" and every state
+    change cost O(log kits).
+    """
+
+    def __init__(self, available_from_day, reuse_left):
+        self.available_from_day = [int(day) for day in available_from_day]
+        self.reuse_left = [int(reuse) for reuse in reuse_left]
+        self._rebuild()
+
+    def __len__(self):
+        return len(self.available_from_day)
+
+    def _leaf_value(self, kit):
+        if self.reuse_left[kit] <= 0:
+            return NEVER
+        return self.available_from_day[kit]
+
+    def _rebuild(self):
+        size = 1
+        while size < len(self):
+            size *= 2
+
+        tree = [NEVER] * (2 * size)
+        for kit in range(len(self)):
+            tree[size + kit] = self._leaf_value(kit)
+        for node in range(size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+
+        self._size = size
+        self._tree = tree
+
+    def _update(self, kit):
+        tree = self._tree
+        node = self._size + kit
+        tree[node] = self._leaf_value(kit)
+
+        node //= 2
+        while node:
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    @property
+    def earliest_available_day(self):
+        """
+        Earliest day any kit with reuses left becomes free
+        """
+        return self._tree[1]
+
+    def find(self, start_day):
+        """
+        First kit (pool order) free by start_day, or -1
+        """
+        tree = self._tree
+        if tree[1] > start_day:
+            return -1
+
+        node = 1
+        while node < self._size:
+            node = 2 * node if tree[2 * node] <= start_day else 2 * node + 1
+
+        return node - self._size
+
+    def allocate(self, kit, end_day):
+        self.available_from_day[kit] = int(end_day)
+        self.reuse_left[kit] -= 1
+        self._update(kit)
+
+    def set_state(self, kit, available_from_day=None, reuse_left=None):
+        if available_from_day is not None:
+            self.available_from_day[kit] = int(available_from_day)
+        if reuse_left is not None:
+            self.reuse_left[kit] = int(reuse_left)
+        self._update(kit)
+
+    def add_kit(self, available_from_day, reuse_left):
+        """
+        Append a kit; the tree doubles when full (amortized O(log n))
+        """
+        self.available_from_day.append(int(available_from_day))
+        self.reuse_left.append(int(reuse_left))
+
+        if len(self) > self._size:
+            self._rebuild()
+        else:
+            self._update(len(self) - 1)
+
+        return len(self) - 1
+
+
+def greedy_assignment(available_from_day, reuse_left, start_days, end_days):
+    """
+    Kit index per task (-1 for a shortage): tasks in order, each
+    on the first kit in pool order that is free and has reuses left
+    """
+    allocator = KitAllocator(available_from_day, reuse_left)
+    assigned = np.full(len(start_days), -1, dtype=np.int64)
+
+    for task, (start_day, end_day) in enumerate(zip(start_days.tolist(), end_days.tolist())):
+        kit = allocator.find(start_day)
+        if kit >= 0:
+            allocator.allocate(kit, end_day)
+            assigned[task] = kit
+
+    return assigned
+
+
+def build_allocation_log(schedule, kit_ids, assigned, start_days, end_days) -> pd.DataFrame:
+    """
+    Allocation log in schedule order; assigned holds a kit index
+    per task, -1 for a shortage.
+    """
+    allocated = assigned >= 0
+
+    return pd.DataFrame({
+        "project_id": schedule["project_id"].to_numpy(),
+        "floor_no": schedule["floor_no"].to_numpy(),
+        "element_type": schedule["element_type"].to_numpy(),
+        "kit_id": np.where(allocated, kit_ids[np.maximum(assigned, 0)], None),
+        "start_day": start_days,
+        "end_day": end_days,
+        "status": np.where(allocated, "ALLOCATED", "SHORTAGE"),
+    })
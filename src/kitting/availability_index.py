@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+BEFORE_FIRST_EVENT = np.iinfo(np.int64).min
+
+
+class _TypeTimeline:
+    """
+    Step function of free kits for one formwork type.
+    days[i] -> free[i] holds on [days[i], days[i + 1]).
+    starts / ends are the intervals of the usable kits; the other
+    total_kits - usable kits are never free.
+    """
+
+    def __init__(self, total_kits, starts, ends, usable):
+        self.total_kits = total_kits
+        self.starts = np.sort(starts)
+        self.ends = np.sort(ends)
+
+        event_days = np.unique(np.concatenate([self.starts, self.ends]))
+        busy = (
+            np.searchsorted(self.starts, event_days, side="right")
+            - np.searchsorted(self.ends, event_days, side="right")
+        )
+
+        # Sentinel segment before the first event: every usable kit free
+        self.days = np.concatenate([[BEFORE_FIRST_EVENT], event_days])
+        self.free = np.concatenate([[usable], usable - busy])
+        self.free_positions = np.flatnonzero(self.free > 0)
+
+        # Sparse tables for O(1) range min / max
+        self._min_table = [self.free]
+        self._max_table = [self.free]
+        width = 1
+        while 2 * width <= len(self.free):
+            prev_min, prev_max = self._min_table[-1], self._max_table[-1]
+            self._min_table.append(
+                np.minimum(prev_min[:-width], prev_min[width:])
+            )
+            self._max_table.append(
+                np.maximum(prev_max[:-width], prev_max[width:])
+            )
+            width *= 2
+
+    def _position(self, day):
+        return int(np.searchsorted(self.days, day, side="right")) - 1
+
+    def free_on(self, day):
+        return int(self.free[self._position(day)])
+
+    def free_range(self, from_day, to_day):
+        lo = self._position(from_day)
+        hi = self._position(to_day)
+        level = (hi - lo + 1).bit_length() - 1
+        span = 1 << level
+
+        return (
+            int(min(self._min_table[level][lo], self._min_table[level][hi - span + 1])),
+            int(max(self._max_table[level][lo], self._max_table[level][hi - span + 1])),
+        )
+
+    def next_free(self, day):
+        pos = self._position(day)
+        k = int(np.searchsorted(self.free_positions, pos))
+
+        if k == len(self.free_positions):
+            return None
+
+        next_pos = self.free_positions[k]
+        return int(day) if next_pos == pos else int(self.days[next_pos])
+
+
+class KitAvailabilityIndex:
+    """
+    Interval index over kit occupancy from an allocation log.
+    Point, range and next-free queries run in logarithmic time
+    without re-scanning the kit pool.
+
+    When the pool carries reuse_left (the budget the plan started
+    from), a kit whose allocations in the log use up that budget is
+    never free: the allocator cannot hand it another task, not even
+    between its planned uses.
+    """
+
+    def __init__(self, kit_pool: pd.DataFrame, allocation_log: pd.DataFrame):
+        kits = kit_pool.drop_duplicates("kit_id").set_index("kit_id")
+        kit_types = kits["formwork_type"]
+        kits_per_type = kit_types.value_counts()
+
+        allocated = allocation_log[allocation_log["status"] == "ALLOCATED"]
+
+        usable_kits = kit_types
+        if "reuse_left" in kits.columns:
+            uses = allocated["kit_id"].value_counts().reindex(kits.index, fill_value=0)
+            usable_kits = kit_types[uses < kits["reuse_left"]]
+
+            allocated = allocated[allocated["kit_id"].isin(usable_kits.index)]
+        usable_per_type = usable_kits.value_counts()
+        allocated_type = allocated["kit_id"].map(kit_types)
+
+        self._timelines = {}
+        for formwork_type, total_kits in kits_per_type.items():
+            mask = (allocated_type == formwork_type).to_numpy()
+            self._timelines[formwork_type] = _TypeTimeline(
+                int(total_kits),
+                allocated["start_day"].to_numpy(dtype=np.int64)[mask],
+                allocated["end_day"].to_numpy(dtype=np.int64)[mask],
+                int(usable_per_type.get(formwork_type, 0)),
+            )
+
+    @property
+    def formwork_types(self):
+        return list(self._timelines)
+
+    @property
+    def nbytes(self):
+        return sum(
+            array.nbytes
+            for timeline in self._timelines.values()
+            for array in [
+                timeline.starts, timeline.ends, timeline.days, timeline.free,
+                timeline.free_positions, *timeline._min_table[1:], *timeline._max_table[1:]
+            ]
+        )
+
+    def _timeline(self, formwork_type):
+        if formwork_type not in self._timelines:
+            raise KeyError(f"Unknown formwork type: {formwork_type}")
+        return self._timelines[formwork_type]
+
+    def free_kits(self, formwork_type, day):
+        """
+        Number of kits of this type free on the given day
+        """
+        return self._timeline(formwork_type).free_on(day)
+
+    def free_kits_range(self, formwork_type, from_day, to_day):
+        """
+        Min / max free kits over [from_day, to_day]
+        """
+        if to_day < from_day:
+            raise ValueError("to_day must be >= from_day")
+
+        min_free, max_free = self._timeline(formwork_type).free_range(
+            from_day, to_day
+        )
+        return {"min_free": min_free, "max_free": max_free}
+
+    def next_free_day(self, formwork_type, day):
+        """
+        First day >= day with at least one free kit (None if never)
+        """
+        return self._timeline(formwork_type).next_free(day)
+
+    def timeline(self, formwork_type, from_day=None, to_day=None) -> pd.DataFrame:
+        """
+        Free / busy step curve for drawing availability charts
+        """
+        timeline = self._timeline(formwork_type)
+
+        days = timeline.days[1:]
+        free = timeline.free[1:]
+        mask = np.ones(len(days), dtype=bool)
+        if from_day is not None:
+            mask &= days >= from_day
+        if to_day is not None:
+            mask &= days <= to_day
+
+        return pd.DataFrame({
+            "day": days[mask],
+            "free_kits": free[mask],
+            "busy_kits": timeline.total_kits - free[mask],
+        })
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+
+class PeakDemandAnalyzer:
+    """
+    Sweep-line demand curve over task intervals
+    [planned_start_day, planned_start_day + cycle_time_days).
+    Cheap enough to run before every allocation.
+    """
+
+    def __init__(self, tasks: pd.DataFrame):
+        self.tasks = tasks
+        self.start_days = tasks["planned_start_day"].to_numpy(dtype=np.int64)
+        self.end_days = self.start_days + tasks["cycle_time_days"].to_numpy(dtype=np.int64)
+
+    def default_group_cols(self):
+        return [
+            col for col in ("formwork_type", "element_type")
+            if col in self.tasks.columns
+        ]
+
+    def demand_curve(self, group_cols=None) -> pd.DataFrame:
+        """
+        Concurrent tasks per day (rows) and group (columns)
+        """
+        group_cols = self.default_group_cols() if group_cols is None else group_cols
+
+        if group_cols:
+            grouped = self.tasks.groupby(group_cols, sort=True)
+            codes = grouped.ngroup().to_numpy()
+            labels = list(grouped.groups.keys())
+        else:
+            codes = np.zeros(len(self.tasks), dtype=np.int64)
+            labels = ["ALL"]
+
+        first_day = int(self.start_days.min(initial=0))
+        n_days = int(self.end_days.max(initial=0)) - first_day + 1
+
+        # +1 at start, -1 at end, then cumulative sum along days
+        delta = np.zeros((len(labels), n_days + 1), dtype=np.int64)
+        np.add.at(delta, (codes, self.start_days - first_day), 1)
+        np.add.at(delta, (codes, self.end_days - first_day), -1)
+        curve = delta.cumsum(axis=1)[:, :n_days]
+
+        return pd.DataFrame(
+            curve.T,
+            index=pd.RangeIndex(first_day, first_day + n_days, name="day"),
+            columns=labels
+        )
+
+    def peak_demand(self, group_cols=None) -> pd.DataFrame:
+        """
+        Peak concurrent kits per group and the days it is reached
+        """
+        curve = self.demand_curve(group_cols)
+        values = curve.to_numpy()
+        peaks = values.max(axis=0, initial=0)
+        at_peak = values == peaks
+
+        days = curve.index.to_numpy()
+        rows = []
+        for col, label in enumerate(curve.columns):
+            peak_days = days[at_peak[:, col]]
+            rows.append({
+                "group": label,
+                "peak_kits": int(peaks[col]),
+                "first_peak_day": int(peak_days[0]),
+                "last_peak_day": int(peak_days[-1]),
+                "peak_day_count": int(len(peak_days)),
+            })
+
+        return pd.DataFrame(rows)
+
+    def assess_capacity(self, kits: pd.DataFrame) -> dict:
+        """
+        Compare demand with the kit pool (one row per kit).
+
+        GUARANTEED_SHORTAGE: more tasks overlap than there are kits,
+        or more tasks than total reuses -> any allocator falls short.
+        SHORTAGE_FREE: proven for the greedy allocator in any task
+        order. A task can only be refused if every kit is either
+        still busy with a task ending after its start or exhausted;
+        both counts are bounded below the kit count here.
+        UNDETERMINED: run the allocation.
+        """
+        usable = kits[kits["reuse_left"] > 0]
+        n_kits = len(usable)
+        n_tasks = len(self.tasks)
+        total_reuses = int(usable["reuse_left"].sum())
+
+        peak = int(self.peak_demand(group_cols=[])["peak_kits"].iloc[0]) if n_tasks else 0
+        lower_bound = max(peak - n_kits, n_tasks - total_reuses, 0)
+
+        assessment = {
+            "total_tasks": n_tasks,
+            "usable_kits": n_kits,
+            "peak_kits": peak,
+            "shortages_lower_bound": lower_bound,
+        }
+
+        if lower_bound > 0:
+            return {**assessment, "verdict": "GUARANTEED_SHORTAGE"}
+
+        if n_tasks == 0:
+            return {**assessment, "verdict": "SHORTAGE_FREE"}
+
+        sorted_ends = np.sort(self.end_days)
+        ending_after_start = n_tasks - np.searchsorted(sorted_ends, self.start_days, side="right")
+        blocking = int((ending_after_start - (self.end_days > self.start_days)).max())
+        exhausted = (n_tasks - 1) // int(usable["reuse_left"].min())
+        ready = int(usable["available_from_day"].max()) <= int(self.start_days.min())
+
+        if ready and blocking + exhausted < n_kits:
+            return {**assessment, "verdict": "SHORTAGE_FREE"}
+
+        return {**assessment, "verdict": "UNDETERMINED"}
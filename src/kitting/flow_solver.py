@@ -0,0 +1,112 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+from src.kitting.allocator import build_allocation_log, greedy_assignment
+
+
+def _max_served_tasks(start_days, end_days, kit_days):
+    """
+    Min-cost flow on the time-expanded network:
+    one unit of flow per kit enters on the day it becomes available,
+    travels along the day axis (holdover arcs) and may detour through
+    a task arc (start -> end, cost -1).
+    Returns a boolean mask of the tasks on the optimal flow.
+    """
+    n_kits = len(kit_days)
+    days = np.unique(np.concatenate([start_days, end_days, kit_days]))
+    n_nodes = len(days)
+    n_tasks = len(start_days)
+
+    task_tail = np.searchsorted(days, start_days)
+    task_head = np.searchsorted(days, end_days)
+    hold_tail = np.arange(n_nodes - 1)
+    hold_head = hold_tail + 1
+
+    tails = np.concatenate([task_tail, hold_tail])
+    heads = np.concatenate([task_head, hold_head])
+    n_arcs = len(tails)
+    arcs = np.arange(n_arcs)
+
+    # Node-arc incidence: +1 leaving, -1 entering
+    incidence = coo_matrix(
+        (
+            np.concatenate([np.ones(n_arcs), -np.ones(n_arcs)]),
+            (np.concatenate([tails, heads]), np.concatenate([arcs, arcs]))
+        ),
+        shape=(n_nodes, n_arcs)
+    ).tocsr()
+
+    supply = np.bincount(np.searchsorted(days, kit_days), minlength=n_nodes).astype(float)
+    supply[-1] -= n_kits
+
+    cost = np.concatenate([-np.ones(n_tasks), np.zeros(n_nodes - 1)])
+    upper = np.concatenate([np.ones(n_tasks), np.full(n_nodes - 1, n_kits)])
+
+    # Network matrix -> the simplex vertex solution is integral
+    result = linprog(
+        cost,
+        A_eq=incidence,
+        b_eq=supply,
+        bounds=np.column_stack([np.zeros(n_arcs), upper]),
+        method="highs-ds"
+    )
+
+    if result.status != 0:
+        raise RuntimeError(f"Min-cost flow solve failed: {result.message}")
+
+    return result.x[:n_tasks] > 0.5
+
+
+def solve_min_cost_flow_plan(kits_df: pd.DataFrame, schedule: pd.DataFrame) -> pd.DataFrame:
+    """
+    Global kit assignment.
+    Picks the largest set of tasks the usable kits (reuses left) can
+    serve at once, then hands the chosen tasks to concrete kits in
+    start-day order, most remaining reuses first.
+
+    The flow ignores reuse budgets (per-kit budgets make the problem
+    a multi-commodity one, without integral LP solutions), so the
+    second pass can run short where greedy would not. The plan with
+    fewer shortages of the two is returned, never a worse one.
+    """
+    kits = kits_df.drop_duplicates("kit_id").reset_index(drop=True)
+    kit_ids = kits["kit_id"].to_numpy()
+    available = kits["available_from_day"].to_numpy(dtype=np.int64)
+    reuse_left = kits["reuse_left"].to_numpy(dtype=np.int64).copy()
+
+    start_days = schedule["planned_start_day"].to_numpy(dtype=np.int64)
+    end_days = start_days + schedule["cycle_time_days"].to_numpy(dtype=np.int64)
+
+    greedy = greedy_assignment(available, reuse_left, start_days, end_days)
+
+    usable = np.flatnonzero(reuse_left > 0)
+    chosen = _max_served_tasks(start_days, end_days, available[usable])
+
+    assigned = np.full(len(schedule), -1, dtype=np.int64)
+    free = []
+    busy = [(available[k], k) for k in usable]
+    heapq.heapify(busy)
+
+    for task in np.flatnonzero(chosen)[np.argsort(start_days[chosen], kind="stable")]:
+        while busy and busy[0][0] <= start_days[task]:
+            _, k = heapq.heappop(busy)
+            heapq.heappush(free, (-reuse_left[k], k))
+
+        if not free:
+            continue
+
+        _, k = heapq.heappop(free)
+        assigned[task] = k
+        reuse_left[k] -= 1
+
+        if reuse_left[k] > 0:
+            heapq.heappush(busy, (end_days[task], k))
+
+    if (greedy >= 0).sum() > (assigned >= 0).sum():
+        assigned = greedy
+
+    return build_allocation_log(schedule, kit_ids, assigned, start_days, end_days)
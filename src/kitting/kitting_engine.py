@@ -1,12 +1,99 @@
+import numpy as np
 import pandas as pd
 
+from src.ingest.vocabularies import normalize_category
+from src.kitting.allocator import build_allocation_log, greedy_assignment
+from src.kitting.availability_index import KitAvailabilityIndex
+from src.kitting.demand_analyzer import PeakDemandAnalyzer
+from src.kitting.online_engine import OnlineKittingEngine
+
+SOLVERS = ("greedy", "min_cost_flow", "partitioned")
+
+# What-if parameters applied on top of the loaded inputs
+SCENARIO_OVERRIDES = (
+    "reuse_limit",       # every kit gets this many reuses
+    "cycle_time_days",   # every task takes this long
+    "cycle_time_scale",  # cycle times multiplied (rounded up, >= 1 day)
+    "start_day_shift",   # every task starts this many days later
+    "extra_units",       # extra kits per formwork type (int or {type: n})
+)
+
+
+def normalize_extra_units(extra_units):
+    """
+    {type alias: n} -> {canonical type: n}, so "Aluminium" adds
+    Aluminum kits and both spellings share one stored plan
+    """
+    if not isinstance(extra_units, dict):
+        return extra_units
+
+    counts = {}
+    for formwork_type, count in extra_units.items():
+        formwork_type = normalize_category(formwork_type, "formwork_type")
+        counts[formwork_type] = counts.get(formwork_type, 0) + count
+    return counts
+
+
+def scenario_overrides(payload: dict) -> dict:
+    """
+    The scenario override fields set in a request payload
+    """
+    overrides = {
+        key: payload[key]
+        for key in SCENARIO_OVERRIDES
+        if payload.get(key) is not None
+    }
+    if "extra_units" in overrides:
+        overrides["extra_units"] = normalize_extra_units(overrides["extra_units"])
+    return overrides
+
 
 class FormworkKittingEngine:
-    def __init__(self, inventory_path, schedule_path):
+    def __init__(self, inventory_path, schedule_path, boq_path=None):
+        self.inventory_path = inventory_path
+        self.schedule_path = schedule_path
+        self.boq_path = boq_path
         self.inventory = pd.read_csv(inventory_path)
         self.schedule = pd.read_csv(schedule_path)
 
-    def build_kitting_plan(self):
+        # Built on first use, reused by every scenario re-plan
+        self._kit_pool = None
+        self._base_pool = None
+        self._typed = None
+        self._start_days = self.schedule["planned_start_day"].to_numpy(dtype=np.int64)
+        self._cycle_days = self.schedule["cycle_time_days"].to_numpy(dtype=np.int64)
+
+    def warm(self):
+        """
+        Build every lazily cached input now and make the arrays
+        read-only, so a shared engine is never written by readers
+        """
+        self._effective_pool()
+        if self.boq_path is not None:
+            try:
+                self._typed_schedule()
+            except ValueError:
+                # Only the partitioned solver needs task types; it
+                # raises the mismatch itself when asked for a plan
+                pass
+
+        self._start_days.flags.writeable = False
+        self._cycle_days.flags.writeable = False
+        return self
+
+    def input_paths(self):
+        paths = [self.inventory_path, self.schedule_path]
+        if self.boq_path is not None:
+            paths.append(self.boq_path)
+        return paths
+
+    def build_kit_pool(self):
+        """
+        One row per physical kit, in allocation priority order
+        """
+        if self._kit_pool is not None:
+            return self._kit_pool
+
         kits = []
 
         for _, inv in self.inventory.iterrows():
@@ -15,50 +102,242 @@ class FormworkKittingEngine:
             reuse_limit = inv["reuse_limit"]
 
             for kit_id in range(1, total_units + 1):
-                kits.append({
+                kit = {
                     "formwork_type": formwork_type,
                     "kit_id": f"{formwork_type[:3].upper()}-KIT-{kit_id}",
                     "available_from_day": 0,
                     "reuse_left": reuse_limit
-                })
+                }
+                if "location" in inv:
+                    kit["location"] = inv["location"]
+                kits.append(kit)
 
-        kits_df = pd.DataFrame(kits)
+        self._kit_pool = pd.DataFrame(kits)
+        return self._kit_pool
 
-        allocation_log = []
+    def _effective_pool(self, kits_df=None):
+        """
+        Kits sharing a kit_id move together, so the allocator
+        works on the first kit of each id
+        """
+        if kits_df is not None:
+            return kits_df.drop_duplicates("kit_id").reset_index(drop=True)
 
-        for _, task in self.schedule.iterrows():
-            eligible_kits = kits_df[
-                (kits_df["available_from_day"] <= task["planned_start_day"]) &
-                (kits_df["reuse_left"] > 0)
-            ]
+        if self._base_pool is None:
+            self._base_pool = self._effective_pool(self.build_kit_pool())
+        return self._base_pool
 
-            if eligible_kits.empty:
-                allocation_log.append({
-                    "project_id": task["project_id"],
-                    "floor_no": task["floor_no"],
-                    "element_type": task["element_type"],
-                    "status": "SHORTAGE"
-                })
-                continue
+    def _extra_kits(self, kits, extra_units, reuse_limit=None):
+        """
+        New kits appended after the existing ones (lowest priority),
+        numbered after the highest kit of their type
+        """
+        if isinstance(extra_units, dict):
+            counts = normalize_extra_units(extra_units)
+        else:
+            counts = {formwork_type: extra_units for formwork_type in kits["formwork_type"].unique()}
 
-            selected_kit = eligible_kits.iloc[0]
+        base = kits.groupby("formwork_type", sort=False).first()
+        numbers = kits["kit_id"].str.rpartition("-")[2].astype(int)
+        last_no = numbers.groupby(kits["formwork_type"]).max()
 
-            start_day = task["planned_start_day"]
-            end_day = start_day + task["cycle_time_days"]
+        extra = []
+        for formwork_type, count in counts.items():
+            if count <= 0:
+                continue
+            if formwork_type not in base.index:
+                raise ValueError(f"Unknown formwork type in extra_units: {formwork_type}")
 
-            allocation_log.append({
-                "project_id": task["project_id"],
-                "floor_no": task["floor_no"],
-                "element_type": task["element_type"],
-                "kit_id": selected_kit["kit_id"],
-                "start_day": start_day,
-                "end_day": end_day,
-                "status": "ALLOCATED"
+            first_no = int(last_no[formwork_type]) + 1
+            frame = pd.DataFrame({
+                "formwork_type": formwork_type,
+                "kit_id": [f"{formwork_type[:3].upper()}-KIT-{n}" for n in range(first_no, first_no + count)],
+                "available_from_day": 0,
+                "reuse_left": base.at[formwork_type, "reuse_left"] if reuse_limit is None else reuse_limit
             })
+            if "location" in kits.columns:
+                frame["location"] = base.at[formwork_type, "location"]
+            extra.append(frame)
+
+        return pd.concat([kits, *extra], ignore_index=True) if extra else kits
+
+    def scenario_inputs(self, overrides=None):
+        """
+        (kits, start_days, end_days) for a what-if: vectorized edits
+        of the cached pool / schedule arrays, no reload or pool rebuild
+        """
+        overrides = overrides or {}
+        unknown = set(overrides) - set(SCENARIO_OVERRIDES)
+        if unknown:
+            raise ValueError(f"Unknown scenario overrides: {sorted(unknown)}")
+
+        kits = self._effective_pool()
+        reuse_limit = overrides.get("reuse_limit")
+
+        if reuse_limit is not None:
+            kits = kits.assign(reuse_left=int(reuse_limit))
+        if overrides.get("extra_units"):
+            kits = self._extra_kits(kits, overrides["extra_units"], reuse_limit)
+
+        start_days = self._start_days + int(overrides.get("start_day_shift", 0))
+
+        cycle_days = self._cycle_days
+        if overrides.get("cycle_time_days") is not None:
+            cycle_days = np.full_like(cycle_days, int(overrides["cycle_time_days"]))
+        if overrides.get("cycle_time_scale") is not None:
+            scaled = np.ceil(cycle_days * float(overrides["cycle_time_scale"]))
+            cycle_days = np.maximum(scaled, 1).astype(np.int64)
+
+        return kits, start_days, start_days + cycle_days
+
+    def _scenario_schedule(self, schedule, start_days, end_days):
+        """
+        Schedule frame carrying the scenario's start days / cycle times
+        (for the solvers that take a frame)
+        """
+        if np.array_equal(start_days, self._start_days) and np.array_equal(
+            end_days - start_days, self._cycle_days
+        ):
+            return schedule
+
+        return schedule.assign(
+            planned_start_day=start_days,
+            cycle_time_days=end_days - start_days
+        )
+
+    def build_kitting_plan(self, solver="greedy", overrides=None):
+        """
+        greedy: first eligible kit per task, in schedule order
+        min_cost_flow: global assignment over the whole schedule
+        partitioned: greedy per formwork-type pool, pools in parallel
+
+        overrides: scenario parameters, see SCENARIO_OVERRIDES
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown kitting solver: {solver}")
+
+        if solver == "partitioned":
+            return self.build_partitioned_plan(overrides=overrides)
+
+        kits, start_days, end_days = self.scenario_inputs(overrides)
+
+        if solver == "min_cost_flow":
+            # scipy is only needed for this mode
+            from src.kitting.flow_solver import solve_min_cost_flow_plan
+            schedule = self._scenario_schedule(self.schedule, start_days, end_days)
+            return solve_min_cost_flow_plan(kits, schedule)
+
+        return self._build_greedy_plan(kits, start_days, end_days)
+
+    def _typed_schedule(self):
+        """
+        Schedule rows with their formwork_type, taken from the BoQ
+        (BoQ lines are schedule rows plus formwork columns)
+        """
+        if "formwork_type" in self.schedule.columns:
+            return self.schedule
+
+        if self.boq_path is None:
+            raise ValueError("Partitioned kitting needs a boq_path for task formwork types")
+
+        if self._typed is None:
+            keys = list(self.schedule.columns)
+            boq = pd.read_csv(self.boq_path, usecols=keys + ["formwork_type"])
+
+            typed = self.schedule.merge(
+                boq.drop_duplicates(keys),
+                on=keys,
+                how="left"
+            )
+
+            # A task without a BoQ line has no pool; allocating it
+            # anyway would report a shortage that is really a data gap
+            unmatched = typed["formwork_type"].isna()
+            if unmatched.any():
+                sample = typed.loc[unmatched, keys[:3]].head(5).to_dict(orient="records")
+                raise ValueError(
+                    f"{int(unmatched.sum())} schedule tasks have no matching BoQ line "
+                    f"in {self.boq_path}, e.g. {sample}"
+                )
+
+            self._typed = typed
+        return self._typed
+
+    def build_partitioned_plan(self, max_workers=None, overrides=None):
+        """
+        Kits of different formwork types (and sites, when both the
+        inventory and the schedule carry a location) never compete,
+        so each pool is allocated independently on its own core
+        """
+        from src.kitting.partitioned import build_partitioned_plan
+
+        kits, start_days, end_days = self.scenario_inputs(overrides)
+        tasks = self._scenario_schedule(self._typed_schedule(), start_days, end_days)
+
+        partition_cols = ["formwork_type"]
+        if "location" in kits.columns and "location" in tasks.columns:
+            partition_cols.append("location")
+
+        return build_partitioned_plan(kits, tasks, partition_cols, max_workers)
+
+    def _build_greedy_plan(self, kits, start_days, end_days):
+        assigned = greedy_assignment(
+            kits["available_from_day"], kits["reuse_left"], start_days, end_days
+        )
+
+        return build_allocation_log(
+            self.schedule,
+            kits["kit_id"].to_numpy(),
+            assigned,
+            start_days,
+            end_days
+        )
+
+    def assess_capacity(self, overrides=None):
+        """
+        Sweep-line lower bound run before allocation; see
+        PeakDemandAnalyzer.assess_capacity for the verdicts
+        """
+        kits, start_days, end_days = self.scenario_inputs(overrides)
+        schedule = self._scenario_schedule(self.schedule, start_days, end_days)
+        return PeakDemandAnalyzer(schedule).assess_capacity(kits)
+
+    def start_online_session(self, overrides=None):
+        """
+        Online engine seeded with the current greedy plan,
+        ready to consume schedule-update events
+        """
+        kits, start_days, end_days = self.scenario_inputs(overrides)
+        schedule = self._scenario_schedule(self.schedule, start_days, end_days)
+        return OnlineKittingEngine(kits, schedule)
+
+    def build_availability_index(self, kitting_plan=None, overrides=None):
+        """
+        Interval index over kit occupancy.
+        Pass a stored plan to avoid rerunning allocation, with the
+        scenario overrides it was planned under (its kit pool may hold
+        extra kits).
+        """
+        if kitting_plan is None:
+            kitting_plan = self.build_kitting_plan(overrides=overrides)
+
+        kits, _, _ = self.scenario_inputs(overrides)
+        return KitAvailabilityIndex(kits, kitting_plan)
+
+    def compare_solvers(self, greedy_plan=None):
+        """
+        Min-cost-flow plan + shortage reduction against greedy
+        """
+        if greedy_plan is None:
+            greedy_plan = self.build_kitting_plan(solver="greedy")
+
+        flow_plan = self.build_kitting_plan(solver="min_cost_flow")
 
-            kits_df.loc[
-                kits_df["kit_id"] == selected_kit["kit_id"],
-                ["available_from_day", "reuse_left"]
-            ] = [end_day, selected_kit["reuse_left"] - 1]
+        greedy_shortages = int((greedy_plan["status"] == "SHORTAGE").sum())
+        flow_shortages = int((flow_plan["status"] == "SHORTAGE").sum())
 
-        return pd.DataFrame(allocation_log)
\ No newline at end of file
+        return flow_plan, {
+            "greedy_shortages": greedy_shortages,
+            "min_cost_flow_shortages": flow_shortages,
+            "shortage_reduction": greedy_shortages - flow_shortages
+        }
@@ -0,0 +1,280 @@
+import json
+from bisect import bisect_left, insort
+from collections import Counter
+
+import pandas as pd
+
+from src.kitting.allocator import KitAllocator
+
+EVENT_TYPES = (
+    "task_added",
+    "task_delayed",
+    "task_completed",
+    "kit_returned",
+    "inventory_added",
+)
+
+
+class OnlineKittingEngine:
+    """
+    Keeps allocator state in memory and applies schedule-update
+    events incrementally. Each event touches only the task / kit it
+    names, plus shortage tasks that freed capacity can now serve.
+
+    Tasks are keyed by integer task_id; tasks seeded from the
+    schedule use their row position.
+    """
+
+    def __init__(self, kits: pd.DataFrame, schedule: pd.DataFrame):
+        self.allocator = KitAllocator(kits["available_from_day"], kits["reuse_left"])
+        self.kit_ids = kits["kit_id"].tolist()
+        self.kit_types = kits["formwork_type"].tolist()
+        self._kit_index = {kit_id: kit for kit, kit_id in enumerate(self.kit_ids)}
+        self._kit_ready_day = kits["available_from_day"].astype(int).tolist()
+        self._kit_tasks = [{} for _ in self.kit_ids]
+
+        # Highest kit number per id prefix, for naming added kits
+        self._last_kit_no = {}
+        for kit_id in self.kit_ids:
+            prefix, _, number = kit_id.rpartition("-")
+            if number.isdigit():
+                self._last_kit_no[prefix] = max(
+                    self._last_kit_no.get(prefix, 0), int(number)
+                )
+
+        self.tasks = {}
+        self._shortages = []
+        self._next_task_id = 0
+        self.stats = Counter()
+
+        # Seeding in schedule order reproduces the batch greedy plan
+        columns = [
+            "project_id",
+            "floor_no",
+            "element_type",
+            "planned_start_day",
+            "cycle_time_days",
+        ]
+        for row in schedule[columns].itertuples(index=False):
+            self._add_task(self._next_task_id, *row)
+
+    # -----------------------------
+    # Allocation primitives
+    # -----------------------------
+    def _assign(self, task_id):
+        task = self.tasks[task_id]
+        kit = self.allocator.find(task["start_day"])
+
+        if kit < 0:
+            task["kit"] = None
+            task["status"] = "SHORTAGE"
+            insort(self._shortages, (task["start_day"], task_id))
+            return
+
+        self.allocator.allocate(kit, task["end_day"])
+        self._kit_tasks[kit][task_id] = task["end_day"]
+        task["kit"] = kit
+        task["status"] = "ALLOCATED"
+
+    def _refresh_kit(self, kit, reuse_left=None):
+        available_from_day = max(
+            [self._kit_ready_day[kit], *self._kit_tasks[kit].values()]
+        )
+        self.allocator.set_state(kit, available_from_day, reuse_left)
+
+    def _release(self, task_id, refund_reuse):
+        task = self.tasks[task_id]
+
+        if task["status"] == "SHORTAGE":
+            pos = bisect_left(self._shortages, (task["start_day"], task_id))
+            del self._shortages[pos]
+            return
+
+        kit = task["kit"]
+        if task["status"] != "ALLOCATED" or kit is None:
+            return
+
+        self._kit_tasks[kit].pop(task_id, None)
+        reuse_left = self.allocator.reuse_left[kit] + (1 if refund_reuse else 0)
+        self._refresh_kit(kit, reuse_left)
+
+    def _replan_shortages(self):
+        """
+        A shortage task fits as soon as the earliest free kit
+        is free by its start day, so every retry succeeds.
+        """
+        while self._shortages:
+            earliest = self.allocator.earliest_available_day
+            pos = bisect_left(self._shortages, (earliest, -1))
+            if pos == len(self._shortages):
+                break
+
+            _, task_id = self._shortages.pop(pos)
+            self._assign(task_id)
+            self.stats["replanned"] += 1
+
+    def _add_task(self, task_id, project_id, floor_no, element_type, start_day, cycle_time_days):
+        if task_id in self.tasks:
+            raise ValueError(f"Task {task_id} already exists")
+
+        self.tasks[task_id] = {
+            "project_id": project_id,
+            "floor_no": floor_no,
+            "element_type": element_type,
+            "start_day": int(start_day),
+            "end_day": int(start_day) + int(cycle_time_days),
+            "kit": None,
+            "status": None,
+        }
+        self._next_task_id = max(self._next_task_id, task_id + 1)
+        self._assign(task_id)
+
+    def _task(self, event):
+        task_id = int(event["task_id"])
+        if task_id not in self.tasks:
+            raise KeyError(f"Unknown task: {task_id}")
+        return task_id
+
+    def _kit(self, event):
+        kit_id = event["kit_id"]
+        if kit_id not in self._kit_index:
+            raise KeyError(f"Unknown kit: {kit_id}")
+        return self._kit_index[kit_id]
+
+    # -----------------------------
+    # Event handlers
+    # -----------------------------
+    def _on_task_added(self, event):
+        task_id = int(event.get("task_id", self._next_task_id))
+        self._add_task(
+            task_id,
+            event.get("project_id"),
+            event.get("floor_no"),
+            event.get("element_type"),
+            event["planned_start_day"],
+            event["cycle_time_days"],
+        )
+        return task_id
+
+    def _on_task_delayed(self, event):
+        task_id = self._task(event)
+        task = self.tasks[task_id]
+
+        if task["status"] == "COMPLETED":
+            raise ValueError(f"Task {task_id} is already completed")
+
+        if "planned_start_day" in event:
+            new_start = int(event["planned_start_day"])
+        else:
+            new_start = task["start_day"] + int(event["delay_days"])
+        cycle_time = int(event.get("cycle_time_days", task["end_day"] - task["start_day"]))
+
+        self._release(task_id, refund_reuse=True)
+        task["start_day"] = new_start
+        task["end_day"] = new_start + cycle_time
+        self._assign(task_id)
+        self._replan_shortages()
+        return task_id
+
+    def _on_task_completed(self, event):
+        task_id = self._task(event)
+        task = self.tasks[task_id]
+        kit = task["kit"] if task["status"] == "ALLOCATED" else None
+
+        self._release(task_id, refund_reuse=False)
+        task["status"] = "COMPLETED"
+
+        if kit is not None:
+            self._kit_ready_day[kit] = int(event.get("day", task["end_day"]))
+            self._refresh_kit(kit)
+
+        self._replan_shortages()
+        return task_id
+
+    def _on_kit_returned(self, event):
+        kit = self._kit(event)
+
+        self._kit_tasks[kit].clear()
+        self._kit_ready_day[kit] = int(event["day"])
+        self._refresh_kit(kit)
+        self._replan_shortages()
+        return self.kit_ids[kit]
+
+    def _on_inventory_added(self, event):
+        formwork_type = event["formwork_type"]
+        prefix = f"{formwork_type[:3].upper()}-KIT"
+        day = int(event.get("day", 0))
+
+        added = []
+        for _ in range(int(event["units"])):
+            self._last_kit_no[prefix] = self._last_kit_no.get(prefix, 0) + 1
+            kit_id = f"{prefix}-{self._last_kit_no[prefix]}"
+            kit = self.allocator.add_kit(day, event["reuse_limit"])
+
+            self.kit_ids.append(kit_id)
+            self.kit_types.append(formwork_type)
+            self._kit_index[kit_id] = kit
+            self._kit_ready_day.append(day)
+            self._kit_tasks.append({})
+            added.append(kit_id)
+
+        self._replan_shortages()
+        return added
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def apply(self, event: dict):
+        event_type = event.get("event")
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        result = getattr(self, f"_on_{event_type}")(event)
+        self.stats[event_type] += 1
+        return result
+
+    def consume(self, events):
+        """
+        Apply an iterable of events; bad events are counted, not fatal
+        """
+        for event in events:
+            try:
+                self.apply(event)
+            except (KeyError, ValueError, TypeError):
+                self.stats["rejected"] += 1
+
+        return dict(self.stats)
+
+    def consume_file(self, path):
+        """
+        NDJSON event file, one event per line
+        """
+        with open(path) as f:
+            return self.consume(json.loads(line) for line in f if line.strip())
+
+    def consume_queue(self, queue, sentinel=None):
+        """
+        Drain a queue.Queue until the sentinel arrives
+        """
+        return self.consume(iter(queue.get, sentinel))
+
+    @property
+    def shortage_count(self):
+        return len(self._shortages)
+
+    def current_plan(self) -> pd.DataFrame:
+        rows = []
+        for task_id in sorted(self.tasks):
+            task = self.tasks[task_id]
+            rows.append({
+                "task_id": task_id,
+                "project_id": task["project_id"],
+                "floor_no": task["floor_no"],
+                "element_type": task["element_type"],
+                "kit_id": self.kit_ids[task["kit"]] if task["kit"] is not None else None,
+                "start_day": task["start_day"],
+                "end_day": task["end_day"],
+                "status": task["status"],
+            })
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.kitting.allocator import KitAllocator, build_allocation_log
+
+# Long-lived worker pools, one per size
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class SharedArrays:
+    """
+    int64 arrays living in multiprocessing.shared_memory,
+    so workers read and write kit / task state without pickling it
+    """
+
+    def __init__(self, **arrays):
+        self.blocks = {}
+        self.arrays = {}
+
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values, dtype=np.int64)
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 8))
+            view = np.ndarray(values.shape, dtype=np.int64, buffer=block.buf)
+            view[:] = values
+
+            self.blocks[name] = block
+            self.arrays[name] = view
+
+    def spec(self):
+        return {
+            name: (block.name, self.arrays[name].shape)
+            for name, block in self.blocks.items()
+        }
+
+    def close(self):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+def _executor(workers):
+    """
+    Shared process pool, started once. Workers come from forkserver
+    (spawn where that is missing), never fork: plans are built from
+    API worker threads, and a forked child of a threaded process can
+    deadlock on a lock another thread held.
+    """
+    with _executors_lock:
+        if workers not in _executors:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            _executors[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return _executors[workers]
+
+
+def _discard_executor(workers, executor):
+    with _executors_lock:
+        if _executors.get(workers) is executor:
+            del _executors[workers]
+
+
+@contextmanager
+def _attached(spec):
+    """
+    Worker-side views onto the shared blocks of one plan; the views
+    must be gone before the blocks close
+    """
+    blocks = {
+        name: shared_memory.SharedMemory(name=block_name)
+        for name, (block_name, _) in spec.items()
+    }
+    arrays = {
+        name: np.ndarray(shape, dtype=np.int64, buffer=blocks[name].buf)
+        for name, (_, shape) in spec.items()
+    }
+    try:
+        yield arrays
+    finally:
+        arrays.clear()
+        for block in blocks.values():
+            block.close()
+
+
+def _allocate_partition(spec, kit_lo, kit_hi, task_lo, task_hi):
+    with _attached(spec) as arrays:
+        return _allocate_pool(arrays, kit_lo, kit_hi, task_lo, task_hi)
+
+
+def _allocate_pool(arrays, kit_lo, kit_hi, task_lo, task_hi):
+    """
+    Greedy allocation of one pool. Kit state and results are
+    written straight into shared memory.
+    """
+    available = arrays["available_from_day"]
+    reuse_left = arrays["reuse_left"]
+    task_order = arrays["task_order"]
+    start_days = arrays["start_days"]
+    end_days = arrays["end_days"]
+    assigned = arrays["assigned"]
+
+    allocator = KitAllocator(available[kit_lo:kit_hi], reuse_left[kit_lo:kit_hi])
+
+    for task in task_order[task_lo:task_hi].tolist():
+        kit = allocator.find(int(start_days[task]))
+        if kit >= 0:
+            allocator.allocate(kit, int(end_days[task]))
+            assigned[task] = kit_lo + kit
+
+    available[kit_lo:kit_hi] = allocator.available_from_day
+    reuse_left[kit_lo:kit_hi] = allocator.reuse_left
+
+    return task_hi - task_lo
+
+
+def _group_bounds(codes, n_groups):
+    """
+    Start / end offsets of each code in a stably sorted array
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    ends = np.cumsum(counts)
+    return ends - counts, ends
+
+
+def build_partitioned_plan(kits, tasks, partition_cols, max_workers=None) -> pd.DataFrame:
+    """
+    Split kits and tasks into independent pools (one per value of
+    partition_cols), allocate the pools in parallel on a shared process
+    pool and merge the logs back in schedule order.
+
+    Within a pool the result equals the greedy plan restricted to
+    that pool's kits and tasks.
+    """
+    pools = pd.MultiIndex.from_frame(
+        pd.concat([kits[partition_cols], tasks[partition_cols]]).drop_duplicates()
+    )
+    kit_codes = pools.get_indexer(pd.MultiIndex.from_frame(kits[partition_cols]))
+    task_codes = pools.get_indexer(pd.MultiIndex.from_frame(tasks[partition_cols]))
+
+    # Pool-contiguous layout, pool order preserved inside each slice
+    kit_order = np.argsort(kit_codes, kind="stable")
+    task_order = np.argsort(task_codes, kind="stable")
+    kit_lo, kit_hi = _group_bounds(kit_codes, len(pools))
+    task_lo, task_hi = _group_bounds(task_codes, len(pools))
+
+    pool_kits = kits.iloc[kit_order].reset_index(drop=True)
+    start_days = tasks["planned_start_day"].to_numpy(dtype=np.int64)
+    end_days = start_days + tasks["cycle_time_days"].to_numpy(dtype=np.int64)
+
+    shared = SharedArrays(
+        available_from_day=pool_kits["available_from_day"].to_numpy(),
+        reuse_left=pool_kits["reuse_left"].to_numpy(),
+        task_order=task_order,
+        start_days=start_days,
+        end_days=end_days,
+        assigned=np.full(len(tasks), -1),
+    )
+
+    try:
+        jobs = [
+            (int(kit_lo[p]), int(kit_hi[p]), int(task_lo[p]), int(task_hi[p]))
+            for p in range(len(pools))
+            if task_hi[p] > task_lo[p] and kit_hi[p] > kit_lo[p]
+        ]
+        # Largest pools first for better load balance
+        jobs.sort(key=lambda job: job[3] - job[2], reverse=True)
+
+        if jobs:
+            workers = max_workers or os.cpu_count() or 1
+            executor = _executor(workers)
+            spec = shared.spec()
+            try:
+                list(executor.map(_allocate_partition, [spec] * len(jobs), *zip(*jobs)))
+            except BrokenProcessPool:
+                # A worker died; the next plan starts a fresh pool
+                _discard_executor(workers, executor)
+                raise
+
+        assigned = shared.arrays["assigned"].copy()
+    finally:
+        shared.close()
+
+    return build_allocation_log(
+        tasks,
+        pool_kits["kit_id"].to_numpy(),
+        assigned,
+        start_days,
+        end_days
+    )
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from src.core.paths import data_path
+
+DEFAULT_DB_PATH = data_path("kitting_plans.sqlite")
+
+PLAN_COLUMNS = [
+    "project_id",
+    "floor_no",
+    "element_type",
+    "kit_id",
+    "start_day",
+    "end_day",
+    "status",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    plan_key TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    total_tasks INTEGER NOT NULL,
+    allocated INTEGER NOT NULL,
+    shortages INTEGER NOT NULL,
+    params TEXT
+);
+
+CREATE TABLE IF NOT EXISTS plan_tasks (
+    plan_id INTEGER NOT NULL,
+    task_idx INTEGER NOT NULL,
+    project_id TEXT,
+    floor_no INTEGER,
+    element_type TEXT,
+    kit_id TEXT,
+    start_day INTEGER,
+    end_day INTEGER,
+    status TEXT NOT NULL,
+    PRIMARY KEY (plan_id, task_idx)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_project
+    ON plan_tasks (plan_id, project_id, floor_no);
+CREATE INDEX IF NOT EXISTS idx_tasks_kit
+    ON plan_tasks (plan_id, kit_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_day
+    ON plan_tasks (plan_id, status, start_day);
+CREATE INDEX IF NOT EXISTS idx_tasks_day
+    ON plan_tasks (plan_id, start_day, end_day);
+"""
+
+
+def plan_key_for(paths, params=None) -> str:
+    """
+    Content hash of the plan inputs (files + solver params).
+    Same inputs -> same key -> stored plan is reused.
+    """
+    digest = hashlib.sha256()
+
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+    digest.update(json.dumps(params or {}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class KittingPlanStore:
+    """
+    SQLite-backed store for kitting plans.
+    Each plan is saved once and queried through indexed lookups
+    instead of being recomputed.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def find_plan(self, plan_key):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT plan_id FROM plans WHERE plan_key = ?",
+                (plan_key,)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def save_plan(self, plan_key, plan_df: pd.DataFrame, params=None) -> int:
+        tasks = plan_df.reindex(columns=PLAN_COLUMNS).copy()
+        tasks.insert(0, "task_idx", range(len(tasks)))
+
+        allocated = int((tasks["status"] == "ALLOCATED").sum())
+        shortages = int((tasks["status"] == "SHORTAGE").sum())
+
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO plans
+                    (plan_key, created_at, total_tasks, allocated, shortages, params)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (plan_key) DO NOTHING
+                """,
+                (
+                    plan_key,
+                    datetime.now(timezone.utc).isoformat(),
+                    len(tasks),
+                    allocated,
+                    shortages,
+                    json.dumps(params or {}, sort_keys=True),
+                )
+            )
+            if cursor.rowcount == 0:
+                # Another writer (thread or process) stored the same
+                # inputs first; its plan is identical
+                return conn.execute(
+                    "SELECT plan_id FROM plans WHERE plan_key = ?",
+                    (plan_key,)
+                ).fetchone()[0]
+
+            plan_id = cursor.lastrowid
+
+            tasks.insert(0, "plan_id", plan_id)
+            tasks.to_sql("plan_tasks", conn, if_exists="append", index=False)
+
+        return plan_id
+
+    def latest_plan_id(self, exclude_params=()):
+        """
+        Most recent plan; exclude_params skips plans whose params set
+        any of these keys (e.g. scenario overrides)
+        """
+        sql = "SELECT MAX(plan_id) FROM plans"
+        if exclude_params:
+            sql += " WHERE " + " AND ".join(["json_extract(params, ?) IS NULL"] * len(exclude_params))
+
+        with closing(self._connect()) as conn:
+            row = conn.execute(sql, [f"$.{key}" for key in exclude_params]).fetchone()
+
+        return row[0]
+
+    def get_params(self, plan_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT params FROM plans WHERE plan_id = ?",
+                (plan_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0] or "{}")
+
+    def list_plans(self) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT * FROM plans ORDER BY plan_id DESC", conn
+            )
+
+    def get_summary(self, plan_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                """
+                SELECT total_tasks, allocated, shortages
+                FROM plans WHERE plan_id = ?
+                """,
+                (plan_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "total_tasks": row[0],
+            "allocated": row[1],
+            "shortages": row[2]
+        }
+
+    def load_plan(self, plan_id) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                "SELECT " + ", ".join(PLAN_COLUMNS)
+                + " FROM plan_tasks WHERE plan_id = ? ORDER BY task_idx",
+                conn,
+                params=[plan_id]
+            )
+
+    def query_tasks(
+        self,
+        plan_id,
+        project_id=None,
+        floor_no=None,
+        kit_id=None,
+        status=None,
+        from_day=None,
+        to_day=None,
+        limit=1000
+    ) -> pd.DataFrame:
+        """
+        Indexed lookup of plan tasks.
+        The day range matches any task whose [start_day, end_day]
+        overlaps [from_day, to_day].
+        """
+        clauses = ["plan_id = ?"]
+        params = [plan_id]
+
+        filters = {
+            "project_id = ?": project_id,
+            "floor_no = ?": floor_no,
+            "kit_id = ?": kit_id,
+            "status = ?": status,
+            "end_day >= ?": from_day,
+            "start_day <= ?": to_day,
+        }
+
+        for clause, value in filters.items():
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        sql = (
+            "SELECT task_idx, " + ", ".join(PLAN_COLUMNS)
+            + " FROM plan_tasks WHERE " + " AND ".join(clauses)
+            + " ORDER BY task_idx LIMIT ?"
+        )
+        params.append(limit)
+
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
@@ -0,0 +1,213 @@
+import copy
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+from src.core.fileio import atomic_write
+from src.ml.train_model import (
+    DATA_PATH,
+    MODEL_PATH,
+    SPLIT_SEED,
+    TEST_SIZE,
+    categorical_cols,
+    numeric_cols,
+)
+
+TARGET = "required_new_units"
+COLUMNS = categorical_cols + numeric_cols + [TARGET]
+
+STATE_DIR = "models/incremental"
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Content hash per training row. Columns are cast to one canonical
+    dtype first, so a row hashes the same freshly built or read back
+    from CSV.
+    """
+    canonical = pd.DataFrame({
+        col: df[col].astype(str) if col in categorical_cols else df[col].astype("float64")
+        for col in COLUMNS
+    })
+    return pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+
+
+class IncrementalTrainer:
+    """
+    Warm-start retraining on rows not seen before.
+
+    New rows (deduplicated by content hash against the whole history)
+    are appended to the training CSV. A share of them joins a fixed
+    holdout set; the rest trains extra trees that are added to the
+    published forest, using the published pipeline's already fitted
+    preprocessing. The grown model replaces the published one only if
+    its holdout MAE is no worse.
+
+    The holdout starts as train_model's test split of the history, so
+    it only holds rows the published model was never fitted on. This
+    assumes the first update runs against the CSV the model was
+    trained from.
+
+    State (seen-row hashes, holdout rows) lives in state_dir.
+    """
+
+    def __init__(
+        self,
+        data_path=DATA_PATH,
+        model_path=MODEL_PATH,
+        state_dir=STATE_DIR,
+        trees_per_update=20,
+        max_trees=400,
+        holdout_fraction=0.2,
+        random_state=42
+    ):
+        self.data_path = data_path
+        self.model_path = model_path
+        self.state_dir = state_dir
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.holdout_fraction = holdout_fraction
+        self.random_state = random_state
+
+        self.hashes_path = os.path.join(state_dir, "row_hashes.npy")
+        self.holdout_path = os.path.join(state_dir, "holdout.csv")
+
+    # -----------------------------
+    # State
+    # -----------------------------
+    def _bootstrap(self):
+        """
+        First run: hash the existing history and seed the holdout with
+        its test split (same split as train_model)
+        """
+        os.makedirs(self.state_dir, exist_ok=True)
+        history = pd.read_csv(self.data_path)
+
+        np.save(self.hashes_path, np.unique(row_hashes(history)))
+
+        train, holdout = train_test_split(history, test_size=TEST_SIZE, random_state=SPLIT_SEED)
+
+        # Test rows repeating a training row were seen after all
+        holdout = holdout[~np.isin(row_hashes(holdout), row_hashes(train))]
+        if len(holdout) > 50_000:
+            holdout = holdout.sample(n=50_000, random_state=self.random_state)
+        holdout[COLUMNS].to_csv(self.holdout_path, index=False)
+
+    def _known_hashes(self):
+        if not os.path.exists(self.hashes_path):
+            self._bootstrap()
+        return np.load(self.hashes_path)
+
+    def select_new_rows(self, rows: pd.DataFrame):
+        """
+        Rows whose content is not in the history yet (and not
+        repeated within the batch), with their hashes
+        """
+        known = self._known_hashes()
+        hashes = row_hashes(rows)
+
+        _, first = np.unique(hashes, return_index=True)
+        is_first = np.zeros(len(rows), dtype=bool)
+        is_first[first] = True
+
+        mask = is_first & ~np.isin(hashes, known)
+        return rows[mask][COLUMNS].reset_index(drop=True), hashes[mask]
+
+    # -----------------------------
+    # Model
+    # -----------------------------
+    @staticmethod
+    def _features(pipeline, rows):
+        # Same column order as at fit time
+        return rows[list(pipeline.feature_names_in_)]
+
+    def _mae(self, pipeline, rows):
+        return mean_absolute_error(rows[TARGET], pipeline.predict(self._features(pipeline, rows)))
+
+    def _grow(self, pipeline, rows):
+        """
+        Copy of the pipeline with trees_per_update extra trees fitted
+        on the new rows only; the oldest trees are dropped beyond
+        max_trees
+        """
+        candidate = copy.deepcopy(pipeline)
+        preprocessing = candidate.named_steps["preprocessing"]
+        forest = candidate.named_steps["model"]
+
+        # Fitted preprocessing is reused as is, never refit
+        X = preprocessing.transform(self._features(pipeline, rows))
+
+        forest.set_params(
+            warm_start=True,
+            n_estimators=len(forest.estimators_) + self.trees_per_update,
+            random_state=self.random_state + len(forest.estimators_)
+        )
+        forest.fit(X, rows[TARGET])
+        forest.set_params(warm_start=False)
+
+        if len(forest.estimators_) > self.max_trees:
+            forest.estimators_ = forest.estimators_[-self.max_trees:]
+            forest.set_params(n_estimators=self.max_trees)
+
+        return candidate
+
+    def _publish(self, pipeline):
+        # Serving processes reload this file while it is replaced
+        atomic_write(self.model_path, lambda tmp: joblib.dump(pipeline, tmp))
+
+    # -----------------------------
+    # Update
+    # -----------------------------
+    def update(self, rows: pd.DataFrame):
+        new_rows, new_hashes = self.select_new_rows(rows)
+
+        report = {"rows_in": len(rows), "new_rows": len(new_rows), "published": False}
+        if new_rows.empty:
+            return report
+
+        holdout_mask = np.random.default_rng(self.random_state + len(new_hashes)).random(
+            len(new_rows)
+        ) < self.holdout_fraction
+        train_rows = new_rows[~holdout_mask]
+
+        holdout = pd.concat([pd.read_csv(self.holdout_path), new_rows[holdout_mask]], ignore_index=True)
+
+        pipeline = joblib.load(self.model_path)
+        mae_before = self._mae(pipeline, holdout)
+
+        candidate = pipeline
+        if not train_rows.empty:
+            candidate = self._grow(pipeline, train_rows)
+        mae_after = self._mae(candidate, holdout)
+
+        published = candidate is not pipeline and mae_after <= mae_before
+        if published:
+            self._publish(candidate)
+
+        # History grows either way; rejected rows are not offered again
+        header = pd.read_csv(self.data_path, nrows=0).columns
+        new_rows[header].to_csv(self.data_path, mode="a", header=False, index=False)
+        new_rows[holdout_mask].to_csv(self.holdout_path, mode="a", header=False, index=False)
+        np.save(self.hashes_path, np.union1d(self._known_hashes(), new_hashes))
+
+        report.update({
+            "train_rows": int(len(train_rows)),
+            "holdout_rows": int(len(holdout)),
+            "trees": len((candidate if published else pipeline).named_steps["model"].estimators_),
+            "mae_before": round(float(mae_before), 4),
+            "mae_after": round(float(mae_after), 4),
+            "published": published,
+        })
+        return report
+
+
+if __name__ == "__main__":
+    from src.ml.prepare_training_data import TrainingDataBuilder
+
+    # Rebuild from the current data; only rows not trained on before are used
+    report = IncrementalTrainer().update(TrainingDataBuilder().build())
+    print(report)
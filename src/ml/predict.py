@@ -1,23 +1,40 @@
 import joblib
 import pandas as pd
 
-MODEL_PATH = "models/formwork_demand_model.pkl"
+from src.core.paths import MODEL_PATH
+from src.core.state import SnapshotHolder
+from src.ingest.vocabularies import normalize_payload
 
-_model = None
+
+def _model_loader(model_path):
+    def build(previous):
+        return {"model": joblib.load(model_path), "model_path": model_path}
+    return build
+
+
+# Shared by all request threads; loaded on first use
+model_state = SnapshotHolder(_model_loader(MODEL_PATH))
 
 
 def load_model():
-    global _model
-    if _model is None:
-        _model = joblib.load(MODEL_PATH)
-    return _model
+    return model_state.current().model
+
+
+def reload_model(model_path=None):
+    """
+    Load a model file and swap it in; requests already scoring
+    keep the model they started with
+    """
+    if model_path is None:
+        model_path = model_state.current().model_path
+    return model_state.publish(_model_loader(model_path))
 
 
 # 🔒 SAFE DEFAULTS — MUST MATCH TRAINING VALUES
 CATEGORICAL_DEFAULTS = {
     "project_type": "Residential",
     "element_type": "Slab",
-    "formwork_type": "Aluminium",
+    "formwork_type": "Aluminum",
 }
 
 NUMERIC_DEFAULTS = {
@@ -30,34 +47,46 @@ NUMERIC_DEFAULTS = {
 }
 
 
+# API payloads (ProjectInput) say "area"; the model feature is area_sqm
+FEATURE_ALIASES = {"area": "area_sqm"}
+
+
+def _model_row(payload: dict) -> dict:
+    row = normalize_payload(payload)
+    for alias, feature in FEATURE_ALIASES.items():
+        if feature not in row and alias in row:
+            row[feature] = row[alias]
+    return row
+
+
 def predict_formwork(payload: dict) -> float:
     """
     Robust ML inference with categorical safety
     """
+    return predict_formwork_batch([payload])[0]
+
+
+def predict_formwork_batch(payloads: list) -> list:
+    """
+    One model call for many payloads, same defaults per row
+    """
     model = load_model()
 
     # Model was trained with pandas
     required_columns = list(model.feature_names_in_)
 
-    final_payload = {}
+    # Map UI / alias spellings onto the training vocabulary
+    input_df = pd.DataFrame(
+        [_model_row(payload) for payload in payloads]
+    ).reindex(columns=required_columns)
 
+    # 🔐 Ensure no NaN survives
     for col in required_columns:
-        if col in payload and payload[col] is not None:
-            final_payload[col] = payload[col]
+        if col in CATEGORICAL_DEFAULTS:
+            input_df[col] = input_df[col].fillna(CATEGORICAL_DEFAULTS[col])
         else:
-            # Fill categorical safely
-            if col in CATEGORICAL_DEFAULTS:
-                final_payload[col] = CATEGORICAL_DEFAULTS[col]
-            else:
-                final_payload[col] = NUMERIC_DEFAULTS.get(col, 0)
-
-    input_df = pd.DataFrame([final_payload])[required_columns]
-
-    # 🔐 Ensure no NaN survives
-    input_df = input_df.fillna({
-        **CATEGORICAL_DEFAULTS,
-        **NUMERIC_DEFAULTS
-    })
+            input_df[col] = pd.to_numeric(input_df[col], errors="coerce").fillna(
+                NUMERIC_DEFAULTS.get(col, 0)
+            )
 
-    prediction = model.predict(input_df)[0]
-    return float(prediction)
\ No newline at end of file
+    return [float(prediction) for prediction in model.predict(input_df)]
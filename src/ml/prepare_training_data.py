@@ -1,13 +1,15 @@
+import os
+
 import pandas as pd
 import numpy as np
 
 
 class TrainingDataBuilder:
-    def __init__(self):
-        self.projects = pd.read_csv("data/projects.csv")
-        self.boq = pd.read_csv("data/boq_traditional.csv")
-        self.inventory = pd.read_csv("data/inventory.csv")
-        self.schedule = pd.read_csv("data/schedule.csv")
+    def __init__(self, data_dir="data"):
+        self.projects = pd.read_csv(os.path.join(data_dir, "projects.csv"))
+        self.boq = pd.read_csv(os.path.join(data_dir, "boq_traditional.csv"))
+        self.inventory = pd.read_csv(os.path.join(data_dir, "inventory.csv"))
+        self.schedule = pd.read_csv(os.path.join(data_dir, "schedule.csv"))
 
     def build(self):
         # Merge BoQ with Projects
@@ -78,6 +80,7 @@ if __name__ == "__main__":
     builder = TrainingDataBuilder()
     training_data = builder.build()
 
+    os.makedirs("data/processed", exist_ok=True)
     training_data.to_csv(
         "data/processed/ml_training_data.csv",
         index=False
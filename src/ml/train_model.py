@@ -8,13 +8,14 @@ from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
 
+from src.core.paths import MODEL_PATH
 
-# Load dataset
-df = pd.read_csv("data/processed/ml_training_data.csv")
+DATA_PATH = "data/processed/ml_training_data.csv"
 
-# Features & Target
-X = df.drop("required_new_units", axis=1)
-y = df["required_new_units"]
+# Train-test split; incremental retraining reuses it to find the rows
+# the published model never trained on
+TEST_SIZE = 0.2
+SPLIT_SEED = 42
 
 # Categorical & Numeric columns
 categorical_cols = [
@@ -32,45 +33,60 @@ numeric_cols = [
     "reuse_limit"
 ]
 
-# Preprocessing
-preprocessor = ColumnTransformer(
-    transformers=[
-        ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
-        ("num", "passthrough", numeric_cols),
-    ]
-)
-
-# Model
-model = RandomForestRegressor(
-    n_estimators=200,
-    max_depth=12,
-    random_state=42
-)
-
-# Pipeline
-pipeline = Pipeline(
-    steps=[
-        ("preprocessing", preprocessor),
-        ("model", model),
-    ]
-)
-
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# Train
-pipeline.fit(X_train, y_train)
-
-# Evaluate
-y_pred = pipeline.predict(X_test)
-mae = mean_absolute_error(y_test, y_pred)
-
-print(f"✅ Model trained successfully")
-print(f"📉 Mean Absolute Error: {mae:.2f} units")
-
-# Save model
-joblib.dump(pipeline, "models/formwork_demand_model.pkl")
-
-print("💾 Model saved at models/formwork_demand_model.pkl")
\ No newline at end of file
+
+def train_model(data_path=DATA_PATH, model_path=MODEL_PATH):
+    # Load dataset
+    df = pd.read_csv(data_path)
+
+    # Features & Target
+    X = df.drop("required_new_units", axis=1)
+    y = df["required_new_units"]
+
+    # Preprocessing
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
+            ("num", "passthrough", numeric_cols),
+        ]
+    )
+
+    # Model
+    model = RandomForestRegressor(
+        n_estimators=200,
+        max_depth=12,
+        random_state=42
+    )
+
+    # Pipeline
+    pipeline = Pipeline(
+        steps=[
+            ("preprocessing", preprocessor),
+            ("model", model),
+        ]
+    )
+
+    # Train-test split
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED
+    )
+
+    # Train
+    pipeline.fit(X_train, y_train)
+
+    # Evaluate
+    y_pred = pipeline.predict(X_test)
+    mae = mean_absolute_error(y_test, y_pred)
+
+    print(f"✅ Model trained successfully")
+    print(f"📉 Mean Absolute Error: {mae:.2f} units")
+
+    # Save model
+    joblib.dump(pipeline, model_path)
+
+    print(f"💾 Model saved at {model_path}")
+
+    return mae
+
+
+if __name__ == "__main__":
+    train_model()
@@ -21,7 +21,9 @@ class ScenarioSimulator:
             "scenario": scenario_name,
             "predicted_new_units": result["predicted_new_units"],
             "allocated_tasks": result["kitting_summary"]["allocated"],
-            "shortages": result["kitting_summary"]["shortages"]
+            "shortages": result["kitting_summary"]["shortages"],
+            "shortages_lower_bound": result["kitting_summary"].get("shortages_lower_bound"),
+            "capacity_verdict": result["capacity_verdict"]
         })
 
     def get_comparison_table(self) -> pd.DataFrame:
@@ -0,0 +1,120 @@
+import json
+import os
+
+import pandas as pd
+
+# Each job: inputs split by project_id, inputs copied to every shard,
+# a map over one shard's directory -> partial frame, and a reduce over
+# the partials. Modules are imported inside the functions so a worker
+# only loads what the job it runs needs.
+
+
+# -----------------------------
+# Map: one shard -> partial result
+# -----------------------------
+def map_boq_traditional(shard):
+    from src.boq_traditional import TraditionalBoQCalculator
+
+    calculator = TraditionalBoQCalculator(
+        projects_path=os.path.join(shard, "projects.csv"),
+        boq_path=os.path.join(shard, "boq_traditional.csv")
+    )
+    return calculator.calculate_all_projects()
+
+
+def map_boq_optimized(shard):
+    from src.boq_optimization import OptimizedBoQCalculator
+
+    calculator = OptimizedBoQCalculator(
+        projects_path=os.path.join(shard, "projects.csv"),
+        boq_path=os.path.join(shard, "boq_traditional.csv")
+    )
+    return calculator.calculate_all_projects()
+
+
+def map_required_area(shard):
+    from src.inventory_optimizer import InventoryOptimizer
+
+    optimizer = InventoryOptimizer(
+        inventory_path=os.path.join(shard, "inventory.csv"),
+        optimized_boq_path=os.path.join(shard, "boq_optimized.csv")
+    )
+    return optimizer.required_area_by_type().reset_index()
+
+
+def map_scenarios(spec_path):
+    """
+    Scenario sweeps are sharded by scenario, not by project: kits are
+    shared across projects, so each scenario needs the whole schedule
+    """
+    from src.optimization.scenario_simulator import ScenarioSimulator
+
+    with open(spec_path) as f:
+        spec = json.load(f)
+
+    simulator = ScenarioSimulator(spec["base_payload"])
+    for name, overrides in spec["scenarios"]:
+        simulator.run_scenario(name, overrides)
+
+    return simulator.get_comparison_table()
+
+
+# -----------------------------
+# Reduce: partials -> final frame
+# -----------------------------
+def _in_project_order(partials, projects_path):
+    """
+    Concatenate per-project partials in projects.csv order,
+    matching the single-machine calculate_all_projects()
+    """
+    order = pd.read_csv(projects_path, usecols=["project_id"])["project_id"].unique()
+    result = pd.concat(partials, ignore_index=True)
+
+    position = pd.Series(range(len(order)), index=order)
+    return result.iloc[result["project_id"].map(position).argsort(kind="stable")].reset_index(drop=True)
+
+
+def reduce_boq(partials, data_dir):
+    return _in_project_order(partials, os.path.join(data_dir, "projects.csv"))
+
+
+def reduce_inventory_impact(partials, data_dir):
+    from src.inventory_optimizer import InventoryOptimizer
+
+    required_by_type = (
+        pd.concat(partials, ignore_index=True)
+        .groupby("formwork_type")["area_sqm"]
+        .sum()
+    )
+    optimizer = InventoryOptimizer(os.path.join(data_dir, "inventory.csv"))
+    return optimizer.calculate_inventory_impact(required_by_type)
+
+
+def reduce_scenarios(partials, data_dir):
+    return pd.concat(partials, ignore_index=True)
+
+
+JOBS = {
+    "boq_traditional": {
+        "inputs": ("projects", "boq_traditional"),
+        "broadcast": (),
+        "map": map_boq_traditional,
+        "reduce": reduce_boq,
+    },
+    "boq_optimized": {
+        "inputs": ("projects", "boq_traditional"),
+        "broadcast": (),
+        "map": map_boq_optimized,
+        "reduce": reduce_boq,
+    },
+    "inventory_impact": {
+        "inputs": ("boq_optimized",),
+        "broadcast": ("inventory",),
+        "map": map_required_area,
+        "reduce": reduce_inventory_impact,
+    },
+    "scenarios": {
+        "map": map_scenarios,
+        "reduce": reduce_scenarios,
+    },
+}
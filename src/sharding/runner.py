@@ -0,0 +1,220 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import threading
+import time
+import traceback
+
+import pandas as pd
+
+from src.core.fileio import atomic_write
+from src.sharding.jobs import JOBS
+from src.sharding.shards import split_by_project
+from src.sharding.work_queue import FileWorkQueue
+
+
+def _heartbeat(queue, task_id, stop, interval):
+    while not stop.wait(interval):
+        queue.renew(task_id)
+
+
+def _digest(paths):
+    """
+    Content hash of a task's input files. It is part of the task id,
+    so a resumed run only skips tasks whose inputs are unchanged.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def run_worker(queue_root, worker_id=None, lease_seconds=60, max_attempts=3, poll_seconds=0.5):
+    """
+    Claim and run tasks until the queue is drained.
+    Any process that can see queue_root can run this (one per node /
+    core); finished shards are never picked up again.
+    """
+    queue = FileWorkQueue(queue_root, lease_seconds, max_attempts)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    processed = 0
+
+    while True:
+        queue.requeue_expired()
+        task = queue.claim(worker_id)
+
+        if task is None:
+            if queue.is_finished():
+                return processed
+            time.sleep(poll_seconds)
+            continue
+
+        task_id, spec = task["task_id"], task["spec"]
+        stop = threading.Event()
+        threading.Thread(
+            target=_heartbeat,
+            args=(queue, task_id, stop, lease_seconds / 3),
+            daemon=True
+        ).start()
+
+        try:
+            partial = JOBS[spec["job"]]["map"](spec["input"])
+            atomic_write(spec["output"], lambda tmp: partial.to_csv(tmp, index=False))
+            queue.complete(task_id, {"rows": len(partial), "worker_id": worker_id})
+            processed += 1
+        except Exception:
+            try:
+                queue.fail(task_id, traceback.format_exc(limit=5))
+            except FileNotFoundError:
+                # Lease already expired and the task was released
+                pass
+        finally:
+            stop.set()
+
+
+def _execute(queue, tasks, workers, poll_seconds=0.5):
+    """
+    Enqueue tasks (finished ones are skipped), run local worker
+    processes until the queue drains and return the partials in
+    task order
+    """
+    queue.prune(tasks)
+    for task_id, spec in tasks.items():
+        queue.put(task_id, spec)
+
+    worker_args = (queue.root, None, queue.lease_seconds, queue.max_attempts, poll_seconds)
+
+    if workers <= 0:
+        run_worker(*worker_args)
+    else:
+        processes = []
+        while not queue.is_finished():
+            # Replace workers that died (a crash mid-task is recovered
+            # through the lease)
+            processes = [p for p in processes if p.is_alive()]
+            for _ in range(workers - len(processes)):
+                process = multiprocessing.Process(target=run_worker, args=worker_args)
+                process.start()
+                processes.append(process)
+
+            queue.requeue_expired()
+            time.sleep(poll_seconds)
+
+        for process in processes:
+            process.join()
+
+    failures = queue.failures()
+    if failures:
+        first = next(iter(failures.values()))
+        raise RuntimeError(
+            f"{len(failures)} shard(s) failed after {queue.max_attempts} attempts, "
+            f"e.g. {first['task_id']}: {first.get('error')}"
+        )
+
+    return [pd.read_csv(spec["output"]) for spec in tasks.values()]
+
+
+def _prepare(work_dir, resume, lease_seconds, max_attempts):
+    if not resume:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs(os.path.join(work_dir, "results"), exist_ok=True)
+    return FileWorkQueue(os.path.join(work_dir, "queue"), lease_seconds, max_attempts)
+
+
+def run_sharded(
+    job,
+    data_dir="data",
+    work_dir=None,
+    n_shards=8,
+    workers=4,
+    lease_seconds=60,
+    max_attempts=3,
+    resume=True
+):
+    """
+    Split the job's inputs by project_id hash, map every shard through
+    the work queue and reduce the partials.
+
+    resume=True keeps shards finished by an earlier run whose input
+    files are byte-identical; changed shards (or a different shard
+    count) get new task ids and are recomputed.
+    """
+    if job not in JOBS or "inputs" not in JOBS[job]:
+        raise ValueError(f"Unknown sharded job: {job}")
+
+    spec = JOBS[job]
+    work_dir = work_dir or os.path.join(data_dir, "shards", job)
+    queue = _prepare(work_dir, resume, lease_seconds, max_attempts)
+
+    shard_dirs = split_by_project(
+        {name: os.path.join(data_dir, f"{name}.csv") for name in spec["inputs"]},
+        os.path.join(work_dir, "inputs"),
+        n_shards,
+        broadcast={name: os.path.join(data_dir, f"{name}.csv") for name in spec["broadcast"]}
+    )
+
+    tasks = {}
+    for shard in shard_dirs:
+        files = sorted(os.path.join(shard, name) for name in os.listdir(shard))
+        task_id = f"{os.path.basename(shard)}-{_digest(files)}"
+        tasks[task_id] = {
+            "job": job,
+            "input": shard,
+            "output": os.path.join(work_dir, "results", f"{task_id}.csv")
+        }
+
+    partials = _execute(queue, tasks, workers)
+    return spec["reduce"](partials, data_dir)
+
+
+def run_scenario_sweep(
+    base_payload,
+    scenarios,
+    work_dir,
+    chunk_size=4,
+    workers=4,
+    lease_seconds=300,
+    max_attempts=3,
+    resume=True
+):
+    """
+    scenarios: {name: overrides}, run in chunks of chunk_size per task.
+    Returns the ScenarioSimulator comparison table in scenario order.
+    """
+    from src.core.paths import MODEL_PATH
+    from src.core.tenants import INPUT_DATASETS, tenant_data_dir
+
+    queue = _prepare(work_dir, resume, lease_seconds, max_attempts)
+    os.makedirs(os.path.join(work_dir, "inputs"), exist_ok=True)
+
+    # Every chunk reads the owner's kitting inputs and the model
+    data_dir = tenant_data_dir(base_payload.get("owner"))
+    shared = [os.path.join(data_dir, f"{name}.csv") for name in INPUT_DATASETS] + [MODEL_PATH]
+
+    items = list(scenarios.items())
+    tasks = {}
+
+    for start in range(0, len(items), chunk_size):
+        chunk = f"chunk-{start // chunk_size:04d}"
+        spec_path = os.path.join(work_dir, "inputs", f"{chunk}.json")
+
+        with open(spec_path, "w") as f:
+            json.dump({"base_payload": base_payload, "scenarios": items[start:start + chunk_size]}, f)
+
+        task_id = f"{chunk}-{_digest([spec_path, *shared])}"
+
+        tasks[task_id] = {
+            "job": "scenarios",
+            "input": spec_path,
+            "output": os.path.join(work_dir, "results", f"{task_id}.csv")
+        }
+
+    partials = _execute(queue, tasks, workers)
+    return JOBS["scenarios"]["reduce"](partials, None)
@@ -0,0 +1,58 @@
+import os
+import shutil
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+def shard_of(project_ids: pd.Series, n_shards: int) -> np.ndarray:
+    """
+    Shard number per row. CRC32 of the project id, so every node
+    and every run maps a project to the same shard.
+    """
+    codes, uniques = pd.factorize(project_ids.astype(str))
+    unique_shards = np.array(
+        [zlib.crc32(project_id.encode()) % n_shards for project_id in uniques],
+        dtype=np.int64
+    )
+    return unique_shards[codes]
+
+
+def shard_dir(root, shard):
+    return os.path.join(root, f"shard-{shard:04d}")
+
+
+def split_by_project(inputs: dict, root, n_shards, broadcast=None):
+    """
+    inputs: name -> CSV path, each with a project_id column.
+    Writes <root>/shard-NNNN/<name>.csv; all rows of a project land in
+    the same shard. broadcast: name -> path copied whole into every
+    shard (small lookup tables such as the inventory).
+
+    Returns the shard directories that received at least one row.
+    """
+    # Start clean: a shard of an earlier split must not keep a file
+    # that this split leaves out
+    shutil.rmtree(root, ignore_errors=True)
+    used = set()
+
+    for name, path in inputs.items():
+        df = pd.read_csv(path)
+        shards = shard_of(df["project_id"], n_shards)
+
+        for shard in range(n_shards):
+            part = df[shards == shard]
+            if part.empty:
+                continue
+
+            out_dir = shard_dir(root, shard)
+            os.makedirs(out_dir, exist_ok=True)
+            part.to_csv(os.path.join(out_dir, f"{name}.csv"), index=False)
+            used.add(shard)
+
+    for shard in used:
+        for name, path in (broadcast or {}).items():
+            shutil.copyfile(path, os.path.join(shard_dir(root, shard), f"{name}.csv"))
+
+    return [shard_dir(root, shard) for shard in sorted(used)]
@@ -0,0 +1,176 @@
+import json
+import os
+import time
+
+from src.core.fileio import atomic_write
+
+STATES = ("pending", "claimed", "done", "failed")
+
+
+class FileWorkQueue:
+    """
+    Work queue on a local or shared filesystem, no broker needed.
+
+        pending/<task>.json  -- waiting
+        claimed/<task>.json  -- a worker holds it; file mtime is the lease
+        done/<task>.json     -- finished, result metadata
+        failed/<task>.json   -- out of attempts
+
+    A claim is an atomic rename out of pending/, so exactly one worker
+    wins each task. Workers renew the lease by touching the claimed
+    file; tasks whose lease ran out go back to pending/.
+    """
+
+    def __init__(self, root, lease_seconds=60, max_attempts=3):
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        for state in STATES:
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def _path(self, state, task_id):
+        return os.path.join(self.root, state, f"{task_id}.json")
+
+    def _ids(self, state):
+        return sorted(
+            name[:-5]
+            for name in os.listdir(os.path.join(self.root, state))
+            if name.endswith(".json")
+        )
+
+    def _write(self, path, data):
+        def dump(tmp):
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+
+        atomic_write(path, dump)
+
+    def _read(self, path):
+        with open(path) as f:
+            return json.load(f)
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+    def put(self, task_id, spec):
+        """
+        Enqueue a task unless it is already queued, running or done.
+        Returns True when it was added.
+        """
+        if any(os.path.exists(self._path(state, task_id)) for state in ("pending", "claimed", "done")):
+            return False
+
+        # A rerun gives previously failed tasks a fresh set of attempts
+        failed = self._path("failed", task_id)
+        if os.path.exists(failed):
+            os.remove(failed)
+
+        self._write(self._path("pending", task_id), {"task_id": task_id, "attempts": 0, "spec": spec})
+        return True
+
+    def prune(self, keep):
+        """
+        Drop pending tasks not in keep (left over from a run over
+        other inputs). Returns the dropped task ids.
+        """
+        dropped = []
+        for task_id in self._ids("pending"):
+            if task_id not in keep:
+                try:
+                    os.remove(self._path("pending", task_id))
+                    dropped.append(task_id)
+                except FileNotFoundError:
+                    # Claimed in the meantime
+                    pass
+        return dropped
+
+    def counts(self):
+        return {state: len(self._ids(state)) for state in STATES}
+
+    def is_finished(self):
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["claimed"] == 0
+
+    def results(self):
+        return {task_id: self._read(self._path("done", task_id)) for task_id in self._ids("done")}
+
+    def failures(self):
+        return {task_id: self._read(self._path("failed", task_id)) for task_id in self._ids("failed")}
+
+    # -----------------------------
+    # Worker side
+    # -----------------------------
+    def claim(self, worker_id):
+        """
+        Next pending task, or None when nothing is pending
+        """
+        for task_id in self._ids("pending"):
+            claimed = self._path("claimed", task_id)
+            try:
+                os.rename(self._path("pending", task_id), claimed)
+            except FileNotFoundError:
+                # Another worker won this one
+                continue
+
+            task = self._read(claimed)
+            task["attempts"] += 1
+            task["worker_id"] = worker_id
+            self._write(claimed, task)
+            return task
+
+        return None
+
+    def renew(self, task_id):
+        try:
+            os.utime(self._path("claimed", task_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, task_id, result):
+        claimed = self._path("claimed", task_id)
+        try:
+            task = self._read(claimed)
+        except FileNotFoundError:
+            # Lease expired while running; the result still counts
+            task = {"task_id": task_id}
+
+        task["result"] = result
+        self._write(self._path("done", task_id), task)
+
+        for state in ("claimed", "pending"):
+            try:
+                os.remove(self._path(state, task_id))
+            except FileNotFoundError:
+                pass
+
+    def fail(self, task_id, error):
+        """
+        Back to pending while attempts remain, else to failed/
+        """
+        claimed = self._path("claimed", task_id)
+        task = self._read(claimed)
+        task["error"] = error
+
+        state = "pending" if task["attempts"] < self.max_attempts else "failed"
+        self._write(claimed, task)
+        os.rename(claimed, self._path(state, task_id))
+
+    def requeue_expired(self):
+        """
+        Release tasks whose worker stopped renewing the lease
+        (crashed or lost node). Returns the released task ids.
+        """
+        released = []
+        deadline = time.time() - self.lease_seconds
+
+        for task_id in self._ids("claimed"):
+            try:
+                if os.path.getmtime(self._path("claimed", task_id)) < deadline:
+                    self.fail(task_id, "lease expired")
+                    released.append(task_id)
+            except FileNotFoundError:
+                # Completed in the meantime
+                continue
+
+        return released
@@ -0,0 +1,172 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.boq_traditional import TraditionalBoQCalculator
+from src.sharding.runner import run_sharded
+from src.sharding.work_queue import FileWorkQueue
+
+
+def expire(queue, task_id, seconds=3600):
+    past = time.time() - seconds
+    os.utime(os.path.join(queue.root, "claimed", f"{task_id}.json"), (past, past))
+
+
+# -----------------------------
+# FileWorkQueue
+# -----------------------------
+def test_claim_is_exclusive_and_done_tasks_are_not_requeued(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q")
+
+    assert queue.put("a", {"n": 1})
+    assert not queue.put("a", {"n": 1})
+
+    task = queue.claim("w1")
+    assert task["task_id"] == "a" and task["attempts"] == 1
+    assert queue.claim("w2") is None
+
+    queue.complete("a", {"rows": 3})
+
+    assert not queue.put("a", {"n": 1})
+    assert queue.is_finished()
+    assert queue.results()["a"]["result"] == {"rows": 3}
+
+
+def test_expired_lease_is_released_and_retried(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q", lease_seconds=60, max_attempts=3)
+    queue.put("a", {})
+    queue.claim("crashed-worker")
+
+    # Lease still fresh: nothing to release
+    assert queue.requeue_expired() == []
+
+    expire(queue, "a")
+    assert queue.requeue_expired() == ["a"]
+    assert queue.counts()["pending"] == 1
+
+    task = queue.claim("w2")
+    assert task["attempts"] == 2
+    assert task["error"] == "lease expired"
+
+
+def test_renew_keeps_the_lease(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q", lease_seconds=60)
+    queue.put("a", {})
+    queue.claim("w1")
+
+    expire(queue, "a")
+    queue.renew("a")
+
+    assert queue.requeue_expired() == []
+
+
+def test_task_fails_after_max_attempts(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q", lease_seconds=60, max_attempts=2)
+    queue.put("a", {})
+
+    queue.claim("w1")
+    queue.fail("a", "boom")
+    assert queue.counts()["pending"] == 1
+
+    queue.claim("w2")
+    expire(queue, "a")
+    queue.requeue_expired()
+
+    assert queue.counts() == {"pending": 0, "claimed": 0, "done": 0, "failed": 1}
+    assert queue.failures()["a"]["error"] == "lease expired"
+
+    # A new run gets a fresh set of attempts
+    assert queue.put("a", {})
+    assert queue.claim("w3")["attempts"] == 1
+
+
+def test_late_completion_after_expiry_still_counts(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q", lease_seconds=60, max_attempts=3)
+    queue.put("a", {})
+    queue.claim("slow-worker")
+
+    expire(queue, "a")
+    queue.requeue_expired()
+    queue.complete("a", {"rows": 1})
+
+    assert queue.counts() == {"pending": 0, "claimed": 0, "done": 1, "failed": 0}
+
+
+def test_prune_drops_pending_tasks_of_other_inputs(tmp_path):
+    queue = FileWorkQueue(tmp_path / "q")
+    queue.put("old", {})
+    queue.put("new", {})
+
+    assert queue.prune({"new"}) == ["old"]
+    assert queue.counts()["pending"] == 1
+
+
+# -----------------------------
+# run_sharded
+# -----------------------------
+def make_data(data_dir, n_projects=30, rows_per_project=20):
+    rng = np.random.default_rng(0)
+    os.makedirs(data_dir, exist_ok=True)
+
+    project_ids = [f"P{i:03d}" for i in range(1, n_projects + 1)]
+    pd.DataFrame({
+        "project_id": project_ids,
+        "project_type": "Residential",
+        "floors": 10,
+        "location": "Metro",
+        "start_day": 0,
+    }).to_csv(os.path.join(data_dir, "projects.csv"), index=False)
+
+    n = n_projects * rows_per_project
+    pd.DataFrame({
+        "project_id": np.repeat(project_ids, rows_per_project),
+        "quantity": rng.integers(1, 50, n),
+        "total_cost": rng.uniform(1e3, 1e5, n).round(2),
+    }).to_csv(os.path.join(data_dir, "boq_traditional.csv"), index=False)
+
+
+def single_process(data_dir):
+    return TraditionalBoQCalculator(
+        os.path.join(data_dir, "projects.csv"),
+        os.path.join(data_dir, "boq_traditional.csv")
+    ).calculate_all_projects()
+
+
+def test_sharded_matches_single_process(tmp_path):
+    make_data(tmp_path)
+
+    result = run_sharded("boq_traditional", data_dir=tmp_path, n_shards=4, workers=0)
+
+    pd.testing.assert_frame_equal(result, single_process(tmp_path))
+
+
+def test_changed_input_is_not_served_from_a_stale_done_shard(tmp_path):
+    make_data(tmp_path)
+    first = run_sharded("boq_traditional", data_dir=tmp_path, n_shards=4, workers=0)
+
+    boq_path = tmp_path / "boq_traditional.csv"
+    boq = pd.read_csv(boq_path)
+    boq.loc[boq["project_id"] == "P001", "total_cost"] *= 10
+    boq.to_csv(boq_path, index=False)
+
+    result = run_sharded("boq_traditional", data_dir=tmp_path, n_shards=4, workers=0)
+
+    pd.testing.assert_frame_equal(result, single_process(tmp_path))
+    p001 = result["project_id"] == "P001"
+    assert result.loc[p001, "total_cost"].item() == pytest.approx(first.loc[p001, "total_cost"].item() * 10)
+
+    # Only the shard holding P001 was recomputed
+    done = FileWorkQueue(tmp_path / "shards" / "boq_traditional" / "queue").counts()["done"]
+    assert done == 5
+
+
+def test_other_shard_count_does_not_mix_layouts(tmp_path):
+    make_data(tmp_path)
+    run_sharded("boq_traditional", data_dir=tmp_path, n_shards=4, workers=0)
+
+    result = run_sharded("boq_traditional", data_dir=tmp_path, n_shards=3, workers=0)
+
+    pd.testing.assert_frame_equal(result, single_process(tmp_path))